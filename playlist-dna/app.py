@@ -1,9 +1,7 @@
 # app.py
-import os, time
+import importlib, os, time
 from pathlib import Path
 import streamlit as st
-import pandas as pd
-import altair as alt
 
 
 # --- App config ---
@@ -25,17 +23,21 @@ PRIMARY, SECONDARY, FILL = "#43a047", "#2e7d32", "#66bb6a"
 # --- Local imports (after sys.path is already fine for Streamlit) ---
 from src.ui.cover import render_cover
 from src.core.auth import build_spotify_client, spotify_call
-from src.core.fetch import extract_playlist_id, get_playlist_meta, fetch_playlist_tracks, fetch_artists_details
+from src.core.settings import get_setting
+from src.core.fetch import extract_playlist_id
+from src.core.pipeline import load_playlist_shared
 from src.core.stats import compute_stats, compute_evolution_stats, pick_openai_model, llm_vibe_summary_detailed, build_rule_based_summary
 
 def need_analysis():
-    return ("tracks_df" not in st.session_state) or ("enriched" not in st.session_state)
+    return any(k not in st.session_state for k in ("tracks_df", "model", "bundle"))
 
 if need_analysis() and not st.session_state.get("trigger_analyze"):
     render_cover("playlist-dna/assets/cover_image.png", size_px=450)
     st.stop()
 # --- Spotify client ---
 sp = build_spotify_client()
+# Opt-in asyncio transport: track pages and artist chunks on one event loop
+USE_ASYNC_FETCH = str(get_setting("SPOTIFY_ASYNC_FETCH", "")).lower() in ("1", "true", "yes")
 
 # --- Sidebar (only after analysis) ---
 with st.sidebar:
@@ -65,47 +67,64 @@ if st.session_state.get("trigger_analyze"):
         st.error("Please paste a valid **public** playlist link/URI (or a 22-char ID).")
         st.stop()
 
-    with st.status("Analyzing playlist…", state="running") as status:
+    from src.core.bundle import PartialOverview
+    from views.overview import render_overview_partial
+
+    with st.status("Analyzing playlist…", state="running", expanded=True) as status:
         try:
-            status.update(label="Fetching metadata…")
-            meta = get_playlist_meta(sp, pid, market=st.session_state.get("market","US"))
+            market = st.session_state.get("market","US")
+            progress_bar = st.progress(0.0, text="Fetching metadata…")
+            live = st.empty()
+            partial = PartialOverview()
+            last_paint = [None]  # time of the last partial repaint
+
+            def on_batch(progress):
+                done, total = progress["items_done"], progress["total"]
+                progress_bar.progress(min(1.0, done / total) if total else 1.0,
+                                      text=f"{done:,} of {total:,} tracks")
+                partial.add(progress["tracks"], progress["artists"])  # only the new batches
+                # the first batch paints at once, then at most twice a second
+                now = time.time()
+                if done < total and (last_paint[0] is None or now - last_paint[0] >= 0.5):
+                    last_paint[0] = now
+                    with live.container():
+                        render_overview_partial(partial, PALETTE, PRIMARY)
+
+            loaded = load_playlist_shared(sp, pid, market=market, use_async=USE_ASYNC_FETCH,
+                                          on_stage=lambda label: status.update(label=label),
+                                          on_batch=on_batch)
+            live.empty()
+            # frames may be shared with other sessions (single-flight): never mutate them in place
+            meta, tracks_df, dropped = loaded["meta"], loaded["tracks_df"], loaded["dropped"]
+
             owner = (meta.get("owner") or {}).get("display_name", "unknown")
             pname = meta.get("name", "(no name)")
             pcover = ((meta.get("images") or [{}])[0].get("url"))  # may be None
             plink = (meta.get("external_urls") or {}).get("spotify")
 
-            status.update(label="Fetching tracks…")
-            tracks_df, dropped = fetch_playlist_tracks(sp, pid, market=st.session_state.get("market","US"))
-            tracks_df["added_at"] = pd.to_datetime(tracks_df["added_at"], errors="coerce", utc=True)
-            tracks_df["added_by_name"] = tracks_df.get("added_by_name", pd.Series(["unknown"]*len(tracks_df))).fillna("").replace("", "unknown")
             if tracks_df.empty:
                 st.error("No usable tracks (playlist may be episodes/local/region-blocked). Try another.")
                 st.stop()
 
-            status.update(label="Enriching artists/genres…")
-            all_artist_ids = [aid for lst in tracks_df["artist_ids"].dropna().tolist() for aid in (lst or [])]
-            artists_df = fetch_artists_details(sp, all_artist_ids)
-
-            enriched = tracks_df.explode("artist_ids").rename(columns={"artist_ids":"artist_id"})
-            if not artists_df.empty:
-                enriched = enriched.merge(artists_df, on="artist_id", how="left")
-            else:
-                enriched["artist_name"] = enriched["artist"].str.split(", ").str[0]
-                enriched["genres"] = [[] for _ in range(len(enriched))]
-                enriched["artist_popularity"] = None
-
             # persist
             st.session_state["last_pid"] = pid
             st.session_state["meta"] = {
                 "name": pname,
                 "owner": owner,
                 "dropped": dropped,
+                "snapshot_id": meta.get("snapshot_id"),
+                "refresh": loaded["refresh"],
+                "artist_store": loaded["artist_store"],
+                "memory": loaded["memory"],
                 "cover": pcover,
                 "url": plink,
             }
 
             st.session_state["tracks_df"] = tracks_df
-            st.session_state["enriched"] = enriched
+            st.session_state["model"] = loaded["model"]
+            st.session_state["genre_matrix"] = loaded["genres"]
+            st.session_state["bundle"] = loaded["bundle"]
+            st.session_state["search_index"] = loaded["search"]
 
             # stable preview/covers order
             seed = int(time.time())
@@ -113,7 +132,7 @@ if st.session_state.get("trigger_analyze"):
             st.session_state["covers_idx"]  = tracks_df.dropna(subset=["image"]).sample(frac=1, random_state=seed).index.tolist()
 
             st.session_state.pop("trigger_analyze", None)
-            status.update(label="Done ✅", state="complete")
+            status.update(label="Done ✅", state="complete", expanded=False)
         except Exception as e:
             st.error(f"Error: {e}")
             st.stop()
@@ -129,17 +148,13 @@ if st.session_state.get("show_description"):
 
     st.stop()
 
-# --- Views (tabs) ---
-from views.overview import render_overview
-from views.evolution import render_evolution
-from views.genres import render_genres
-from views.artists import render_artists
-from views.time import render_time
-from views.popularity import render_popularity
-from views.covers import render_covers
-from views.search import render_search
-from views.companion import render_companion
-from views.export import render_export
+# --- Views: label -> module (and ?view= slug); each module has render_<module> ---
+VIEWS = {"Overview": "overview", "Evolution": "evolution", "Timelapse": "timelapse", "Genres": "genres",
+         "Artists": "artists", "Time": "time", "Popularity": "popularity", "Covers": "covers", "Search": "search",
+         "Companion (AI)": "companion", "Export": "export"}
+SLUGS = {slug: label for label, slug in VIEWS.items()}
+# keyed widgets of views that are not rendered would otherwise lose their values
+KEEP_WIDGET_STATE = ("genres_tab_filter", "search_q")
 
 
 if not need_analysis():
@@ -207,16 +222,18 @@ if not need_analysis():
 
     #st.divider()
 
-TABS = ["Overview","Evolution","Genres","Artists","Time","Popularity","Covers", "Search", "Companion (AI)", "Export"]
-tab_over, tab_evo, tab_gen, tab_art, tab_time, tab_pop, tab_cov, tab_search, tab_ai, tab_export = st.tabs(TABS)
-
-with tab_over:     render_overview(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_evo:      render_evolution(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_gen:      render_genres(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_art:      render_artists(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_time:     render_time(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_pop:      render_popularity(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_cov:      render_covers(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_search:   render_search(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_ai:       render_companion(PALETTE, PRIMARY, SECONDARY, FILL)
-with tab_export:   render_export()
+# --- Active view only: the others are not imported or computed until opened ---
+for _k in KEEP_WIDGET_STATE:
+    if _k in st.session_state:
+        st.session_state[_k] = st.session_state[_k]
+if st.session_state.get("view") not in VIEWS:
+    # first run of the session: the URL decides (shared links, browser refresh)
+    st.session_state["view"] = SLUGS.get(st.query_params.get("view"), "Overview")
+view = st.radio("View", list(VIEWS), key="view", horizontal=True, label_visibility="collapsed")
+st.query_params["view"] = VIEWS[view]
+
+render_view = getattr(importlib.import_module(f"views.{VIEWS[view]}"), f"render_{VIEWS[view]}")
+if VIEWS[view] == "export":
+    render_view()
+else:
+    render_view(PALETTE, PRIMARY, SECONDARY, FILL)
@@ -1,39 +1,156 @@
 # src/core/auth.py
-import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
 import spotipy
+from spotipy.cache_handler import MemoryCacheHandler
 from spotipy.oauth2 import SpotifyClientCredentials
 from spotipy.exceptions import SpotifyException
+from src.core.rows import json_loads
+from src.core.settings import get_setting
+from src.core.throttle import coordinator, retry_after_seconds
+
+CLIENT_ID = get_setting("SPOTIFY_CLIENT_ID")
+CLIENT_SECRET = get_setting("SPOTIFY_CLIENT_SECRET")
+# Point these at a local stand-in (tools/standin.py) to run without hitting Spotify
+API_BASE = get_setting("SPOTIFY_API_BASE", "https://api.spotify.com/v1/").rstrip("/") + "/"
+TOKEN_URL = get_setting("SPOTIFY_TOKEN_URL", SpotifyClientCredentials.OAUTH_TOKEN_URL)
+
+REFRESH_MARGIN = 300   # refresh the token this many seconds before it expires
+POOL_SIZE = 32         # pooled keep-alive connections shared by every session's workers
+# 429s are not retried by the HTTP layer: spotify_call hands them to the process-wide coordinator
+STATUS_FORCELIST = (500, 502, 503, 504)
+MAX_THROTTLE_RETRIES = 5
+
+
+class SharedCredentials(SpotifyClientCredentials):
+    """Client-credentials manager that is safe to share across threads and sessions.
+
+    One token per process, refreshed under a lock `REFRESH_MARGIN` seconds
+    before expiry, so requests don't race an expiring token. The token is
+    kept in memory only: nothing is written to (or read back from) disk.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("cache_handler", MemoryCacheHandler())
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self._refreshed_at = 0.0
+
+    def get_access_token(self, as_dict=False, check_cache=True):
+        with self._lock:
+            if not check_cache or not self._token or self._expires_at - time.time() < REFRESH_MARGIN:
+                # expiry from this token response, not from a cache another process may share
+                info = self._add_custom_values_to_token_info(self._request_access_token())
+                self._token = info["access_token"]
+                self._expires_at = float(info["expires_at"])
+                self._refreshed_at = time.time()
+            if as_dict:
+                return {"access_token": self._token, "expires_at": int(self._expires_at)}
+            return self._token
+
+    def invalidate(self, min_age: float = 5.0):
+        """Drop the token so the next call fetches a new one (once per `min_age` seconds)."""
+        with self._lock:
+            if time.time() - self._refreshed_at >= min_age:
+                self._token = None
+
+
+def _fast_json(response, *args, **kwargs):
+    # spotipy decodes every payload with response.json(); route it through the faster decoder
+    response.json = lambda **_: json_loads(response.content)
+    return response
+
+
+def _build_session() -> requests.Session:
+    """One pooled session for all API calls; spotipy's retry policy minus 429 handling."""
+    retry = Retry(
+        total=3,
+        connect=None,
+        read=False,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=STATUS_FORCELIST,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,  # out of retries: hand back the last 5xx, not a RetryError spotipy calls a 429
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_fast_json)
+    return session
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_spotify_client() -> spotipy.Spotify:
+    """The process-wide client: built once, then shared by every rerun and every user."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if not CLIENT_ID or not CLIENT_SECRET:
+                st.error("Missing SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET in Streamlit Secrets (or env).")
+                st.stop()
+            auth = SharedCredentials(client_id=CLIENT_ID, client_secret=CLIENT_SECRET)
+            auth.OAUTH_TOKEN_URL = TOKEN_URL
+            if not auth.get_access_token(as_dict=False):  # force early failure if creds wrong
+                st.error("Could not obtain a client-credentials token. Check your Client ID/Secret.")
+                st.stop()
+            _client = spotipy.Spotify(
+                auth_manager=auth,
+                requests_session=_build_session(),
+                requests_timeout=10,
+                retries=3,
+                status_forcelist=STATUS_FORCELIST,
+            )
+            _client.prefix = API_BASE
+        return _client
 
-CLIENT_ID = st.secrets.get("SPOTIFY_CLIENT_ID") or os.getenv("SPOTIFY_CLIENT_ID")
-CLIENT_SECRET = st.secrets.get("SPOTIFY_CLIENT_SECRET") or os.getenv("SPOTIFY_CLIENT_SECRET")
 
 def build_spotify_client():
-    if not CLIENT_ID or not CLIENT_SECRET:
-        st.error("Missing SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET in Streamlit Secrets (or env).")
-        st.stop()
-    auth = SpotifyClientCredentials(client_id=CLIENT_ID, client_secret=CLIENT_SECRET)
-    token = auth.get_access_token()  # force   early failure if creds wrong
-    if not token:
-        st.error("Could not obtain a client-credentials token. Check your Client ID/Secret.")
-        st.stop()
+    client = get_spotify_client()
     st.caption(f"✅ Token acquired · client …{CLIENT_ID[-6:]}")
-    return spotipy.Spotify(
-        auth_manager=auth,
-        requests_timeout=10,
-        retries=3,
-        status_forcelist=(429, 500, 502, 503, 504),
-    )
+    return client
+
+
+def _has_retry_after(headers) -> bool:
+    return any(str(k).lower() == "retry-after" for k in headers)
 
-sp = build_spotify_client()
 
 def spotify_call(fn, *args, **kwargs):
-    """Retry once on 401/403 by rebuilding the client (handles stale token)."""
-    global sp
-    try:
-        return fn(*args, **kwargs)
-    except SpotifyException as e:
-        if getattr(e, "http_status", None) in (401, 403):
-            sp = build_spotify_client()
+    """Every API call goes through here.
+
+    - waits out any global Retry-After pause before sending
+    - on a 429 with Retry-After, reports it to the coordinator (pausing all callers)
+      and retries; other 429s (e.g. spotipy's "Max Retries") are raised as is
+    - on 401/403, retries once with a fresh token (rare: tokens are refreshed ahead of expiry)
+    """
+    refreshed = False
+    throttled = 0
+    while True:
+        coordinator.wait()
+        try:
             return fn(*args, **kwargs)
-        raise
+        except SpotifyException as e:
+            status = getattr(e, "http_status", None)
+            headers = getattr(e, "headers", None) or {}
+            if status == 429 and throttled < MAX_THROTTLE_RETRIES and _has_retry_after(headers):
+                throttled += 1
+                coordinator.report(retry_after_seconds(headers), source=getattr(fn, "__name__", ""))
+                continue
+            if status in (401, 403) and not refreshed:
+                refreshed = True
+                auth = getattr(getattr(fn, "__self__", None) or _client, "auth_manager", None)
+                if hasattr(auth, "invalidate"):
+                    auth.invalidate()
+                continue
+            raise
@@ -0,0 +1,198 @@
+# src/core/bundle.py
+"""Aggregates shared by the views and the Companion, computed once per analysis.
+
+Built at the end of load_playlist for one (playlist_id, snapshot_id, market)
+and never modified afterwards. Every ranked table is stored fully sorted, so
+a "top N" slider is a head() slice and not a fresh groupby; per-track facts
+(popularity rank and percentile, add order, age at add, decade) are one
+row-aligned table, so a view or export looks a track up instead of ranking
+the playlist again.
+"""
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.core.genres import GenreMatrix
+from src.core.model import PlaylistModel
+from src.core.timeline import time_features
+from src.core.trends import GenreTrends, build_trends
+
+PAIR_GENRES = 12  # genres in the co-occurrence block
+
+
+@dataclass(frozen=True)
+class AnalysisBundle:
+    key: tuple                    # (playlist_id, snapshot_id, market)
+    n_tracks: int                 # distinct track ids
+    n_artists: int                # distinct credited artist names
+    median_popularity: float
+    genres: pd.DataFrame          # [genre, count] tracks per genre, most common first
+    genre_pairs: pd.DataFrame     # tracks per genre pair among the top PAIR_GENRES
+    lead_artists: pd.DataFrame    # [artist, count] tracks per lead artist, most common first
+    decades: pd.DataFrame         # [decade, count] by decade, oldest first
+    artist_years: pd.DataFrame    # [lead_artist, release_year, count, rank], ordered by artist rank
+    track_facts: pd.DataFrame     # per track row, same index as the tracks (see _track_facts)
+    popularity_counts: pd.DataFrame  # [popularity, count] per popularity value present
+    times: pd.DataFrame           # added_at calendar keys per dated track (src/core/timeline.py)
+    trends: GenreTrends           # monthly genre counts, cumulative (src/core/trends.py)
+
+    def top_genres(self, k: int | None = None) -> pd.DataFrame:
+        return self.genres.head(k) if k is not None else self.genres
+
+    def top_artists(self, k: int | None = None) -> pd.DataFrame:
+        return self.lead_artists.head(k) if k is not None else self.lead_artists
+
+    def top_artist_years(self, k: int) -> pd.DataFrame:
+        """Artist × year cells of the k lead artists with the most dated tracks."""
+        return self.artist_years.iloc[:int(np.searchsorted(self.artist_years["rank"].to_numpy(), k))]
+
+    def track(self, row: int) -> pd.Series:
+        """Derived facts of the track at position `row` of the tracks frame."""
+        return self.track_facts.iloc[row]
+
+
+def _decades(tracks: pd.DataFrame) -> pd.DataFrame:
+    years = tracks["release_year"].dropna().astype(int) if "release_year" in tracks else pd.Series([], dtype=int)
+    counts = ((years // 10) * 10).value_counts().sort_index()
+    return pd.DataFrame({"decade": counts.index.to_numpy(dtype=int), "count": counts.to_numpy()})
+
+
+def _artist_years(model: PlaylistModel) -> pd.DataFrame:
+    lead = model.lead_artist()
+    years = model.tracks["release_year"] if "release_year" in model.tracks else pd.Series(pd.NA, index=lead.index)
+    ok = (lead.notna() & years.notna()).to_numpy()
+    ay = pd.DataFrame({"lead_artist": lead[ok].astype(object), "release_year": years[ok].astype(int)})
+    ranks = ay["lead_artist"].value_counts()
+    rank = pd.Series(np.arange(len(ranks)), index=ranks.index)
+    cells = ay.groupby(["lead_artist", "release_year"]).size().reset_index(name="count")
+    cells["rank"] = cells["lead_artist"].map(rank).astype(int)
+    return cells.sort_values(["rank", "release_year"], ignore_index=True)
+
+
+def _added_order(tracks: pd.DataFrame) -> np.ndarray:
+    """1-based position of each track by added_at, 0 when unknown."""
+    out = np.zeros(len(tracks), dtype=np.int32)
+    if "added_at" in tracks:
+        valid = np.flatnonzero(tracks["added_at"].notna().to_numpy())
+        stamps = tracks["added_at"].to_numpy()[valid]
+        out[valid[np.argsort(stamps, kind="stable")]] = np.arange(1, len(valid) + 1, dtype=np.int32)
+    return out
+
+
+def _track_facts(tracks: pd.DataFrame, times: pd.DataFrame) -> pd.DataFrame:
+    """Columns (nullable Int64 unless noted), NA where the inputs are missing:
+      popularity_rank  1 = most popular; ties share the best rank
+      popularity_pct   float, % of rated tracks at or below this popularity
+      added_order      1-based position by added_at
+      age_at_add       years between release and added_at
+      decade           release decade (1990, 2000, ...)
+    """
+    n = len(tracks)
+    na = pd.Series(pd.NA, index=tracks.index, dtype="Int64")
+    pop = tracks["popularity"].astype("Float64") if "popularity" in tracks else na.astype("Float64")
+    rated = pop.notna().to_numpy()
+    values = pop.to_numpy(dtype=float, na_value=np.nan)
+    # one sort; "at or below" and "strictly above" counts are binary searches
+    ranked = np.sort(values[rated])
+    at_or_below = np.searchsorted(ranked, values[rated], side="right")
+    rank, pct = na.copy(), np.full(n, np.nan)
+    rank[rated] = len(ranked) - at_or_below + 1
+    pct[rated] = at_or_below / max(len(ranked), 1) * 100.0
+
+    year = tracks["release_year"].astype("Int64") if "release_year" in tracks else na
+    added_year = na.copy()
+    added_year.loc[times.index] = (times["month"] // 12 + 1970).to_numpy()
+    order = pd.Series(_added_order(tracks), index=tracks.index, dtype="Int64")
+    return pd.DataFrame({
+        "popularity_rank": rank,
+        "popularity_pct": pct,
+        "added_order": order.mask(order == 0),
+        "age_at_add": added_year - year,
+        "decade": (year // 10) * 10,
+    }, index=tracks.index)
+
+
+def _popularity_counts(tracks: pd.DataFrame) -> pd.DataFrame:
+    """Tracks per popularity value, for charts that bin on the client."""
+    pop = tracks["popularity"].dropna().astype(int).clip(0, 100).to_numpy() if "popularity" in tracks else np.array([], dtype=int)
+    counts = np.bincount(pop, minlength=101) if len(pop) else np.zeros(101, dtype=np.int64)
+    present = np.flatnonzero(counts)
+    return pd.DataFrame({"popularity": present, "count": counts[present]})
+
+
+def build_bundle(key: tuple, model: PlaylistModel, genres: GenreMatrix) -> AnalysisBundle:
+    tracks = model.tracks
+    genre_counts = genres.top()
+    pop = tracks["popularity"].median() if "popularity" in tracks and len(tracks) else None
+    times = time_features(tracks)
+    return AnalysisBundle(
+        key=key,
+        n_tracks=int(tracks["id"].nunique()) if "id" in tracks else 0,
+        n_artists=model.n_credited_artists() or (int(tracks["artist"].nunique()) if "artist" in tracks else 0),
+        median_popularity=0.0 if pop is None or pd.isna(pop) else float(pop),
+        genres=genre_counts,
+        genre_pairs=genres.cooccurrence(genre_counts["genre"].head(PAIR_GENRES)),
+        lead_artists=model.artist_counts(lead_only=True),
+        decades=_decades(tracks),
+        artist_years=_artist_years(model),
+        track_facts=_track_facts(tracks, times),
+        popularity_counts=_popularity_counts(tracks),
+        times=times,
+        trends=build_trends(genres, times),
+    )
+
+
+# --- partial overview (while pages are still arriving) ---
+class PartialOverview:
+    """Running Overview numbers mid-fetch, with the accessors the Overview reads
+    from AnalysisBundle. `add` folds in only the batches (and artist rows) it
+    has not seen yet, so each page costs its own size however many came before;
+    the model, genre matrix and bundle are built once, after the last page."""
+
+    def __init__(self):
+        self._batches = self._artist_rows = 0
+        self._ids, self._artists = set(), set()   # distinct track ids, credited artist ids
+        self._artist_genres: dict = {}
+        self._genres: Counter = Counter()         # tracks per genre
+        self._pop = np.zeros(101, dtype=np.int64)  # tracks per popularity value
+
+    def add(self, track_batches: list, artists: pd.DataFrame):
+        """`track_batches`/`artists` only ever grow (load_playlist appends to both)."""
+        if len(artists) > self._artist_rows:
+            new = artists.iloc[self._artist_rows:]
+            self._artist_genres.update(zip(new["artist_id"], new["genres"]))
+            self._artist_rows = len(artists)
+        for batch in track_batches[self._batches:]:
+            self._ids.update(batch["id"])
+            for ids in batch["artist_ids"]:
+                ids = ids if isinstance(ids, list) else []
+                self._artists.update(ids)
+                # a genre shared by two artists of the same track counts once
+                self._genres.update({g for a in ids for g in (self._artist_genres.get(a) or ())})
+            if "popularity" in batch:
+                pop = batch["popularity"].dropna().astype(int).clip(0, 100).to_numpy()
+                self._pop += np.bincount(pop, minlength=101)
+        self._batches = len(track_batches)
+
+    @property
+    def n_tracks(self) -> int:
+        return len(self._ids)
+
+    @property
+    def n_artists(self) -> int:
+        return len(self._artists)
+
+    @property
+    def median_popularity(self) -> float:
+        n = int(self._pop.sum())
+        if not n:
+            return 0.0
+        cum = np.cumsum(self._pop)
+        lo, hi = np.searchsorted(cum, [(n - 1) // 2, n // 2], side="right")
+        return (lo + hi) / 2
+
+    def top_genres(self, k: int | None = None) -> pd.DataFrame:
+        top = self._genres.most_common(k)
+        return pd.DataFrame({"genre": [g for g, _ in top], "count": [c for _, c in top]})
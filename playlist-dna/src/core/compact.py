@@ -0,0 +1,80 @@
+# src/core/compact.py
+"""Opt-in compact schema for the session frames, plus footprint accounting.
+
+The model's tracks and artists tables are held in session state for every
+connected user. With PLAYLIST_DNA_COMPACT=1 (secret or env var) they are
+stored with:
+  - categoricals for repeated text (only where values actually repeat)
+  - Int16 years and Int8 popularity
+  - genre lists deduplicated and their strings interned
+"""
+import sys
+
+import pandas as pd
+
+from src.core.settings import get_setting
+
+COMPACT_FRAMES = str(get_setting("PLAYLIST_DNA_COMPACT", "")).lower() in ("1", "true", "yes")
+CATEGORY_MAX_RATIO = 0.5  # categorize a text column when distinct values <= this share of rows
+TEXT_COLUMNS = ("id", "name", "artist", "album", "url", "image", "added_by", "added_by_name",
+                "artist_id", "artist_name")
+SMALL_INTS = {"release_year": "Int16", "popularity": "Int8", "artist_popularity": "Int8"}
+
+
+def _shared_lists(series: pd.Series) -> pd.Series:
+    """Equal lists become one shared list of interned strings (never mutated downstream)."""
+    pool = {}
+    out = []
+    for v in series:
+        if isinstance(v, list):
+            key = tuple(v)
+            v = pool.get(key)
+            if v is None:
+                v = pool[key] = [sys.intern(x) if isinstance(x, str) else x for x in key]
+        out.append(v)
+    return pd.Series(out, index=series.index, dtype=object, name=series.name)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """A copy of `df` in the compact schema; columns it doesn't know are left alone."""
+    out = df.copy()
+    n = len(out)
+    for col in TEXT_COLUMNS:
+        if col in out and n and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            if out[col].nunique(dropna=True) <= CATEGORY_MAX_RATIO * n:
+                out[col] = out[col].astype("category")
+    for col, dtype in SMALL_INTS.items():
+        if col in out:
+            try:
+                out[col] = out[col].astype(dtype)
+            except (TypeError, ValueError):  # non-integral values: keep as is
+                pass
+    if "genres" in out:
+        out["genres"] = _shared_lists(out["genres"])
+    return out
+
+
+def _object_bytes(v, seen: set) -> int:
+    if id(v) in seen:
+        return 0
+    seen.add(id(v))
+    size = sys.getsizeof(v)
+    if isinstance(v, (list, tuple)):
+        size += sum(_object_bytes(x, seen) for x in v)
+    return size
+
+
+def frames_footprint(frames: dict) -> dict:
+    """Bytes per frame plus "total"; Python objects shared between rows or frames count once."""
+    seen, out = set(), {}
+    for name, df in frames.items():
+        size = int(df.index.memory_usage(deep=True))
+        for col in df.columns:
+            s = df[col]
+            if s.dtype == object:
+                size += s.to_numpy().nbytes + sum(_object_bytes(v, seen) for v in s)
+            else:
+                size += int(s.memory_usage(index=False, deep=True))
+        out[name] = size
+    out["total"] = sum(out.values())
+    return out
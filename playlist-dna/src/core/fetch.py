@@ -1,14 +1,23 @@
 # src/core/fetch.py
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import streamlit as st
-from src.core.auth import spotify_call, build_spotify_client
+from src.core.auth import spotify_call
+from src.core.settings import get_setting
+from src.core.ratelimit import get_bucket
+from src.core.store import get_artist_store
+from src.core.rows import META_FIELDS, TRACK_PAGE_FIELDS, artist_row
 
 
 ID_RE = re.compile(r"^[A-Za-z0-9]{22}$")
+PAGE_LIMIT = 100        # max items per playlist-tracks page
+MAX_PAGE_WORKERS = 8    # concurrent page requests per playlist
+ARTIST_CHUNK = 50       # max ids per /artists call
+
+# Artist enrichment throttle (process-wide): requests/sec ceiling and concurrency cap
+ARTIST_RPS = float(get_setting("SPOTIFY_ARTIST_RPS", 10))
+ARTIST_WORKERS = int(get_setting("SPOTIFY_ARTIST_WORKERS", 4))
 
-sp = build_spotify_client()
 
 def extract_playlist_id(s: str):
     if not s:
@@ -25,70 +34,69 @@ def extract_playlist_id(s: str):
     return None
 
 
-@st.cache_data(show_spinner=False, ttl=600)
-def get_playlist_meta(_sp, playlist_id: str, market: str = "US"):
-    return spotify_call(_sp.playlist, playlist_id, market=market)
-
-
-
-@st.cache_data(show_spinner=False, ttl=600)
-def fetch_playlist_tracks(_sp, playlist_id: str, market: str = "US"):
-    results = spotify_call(_sp.playlist_tracks, playlist_id, market=market)
-    items = results.get("items", [])
-    while results.get("next"):
-        results = sp.next(results)
-        items += results.get("items", [])
-
-    rows, dropped = [], 0
-    for it in items:
-        tr = (it or {}).get("track") or {}
-        if tr.get("type") != "track" or tr.get("is_local") or not tr.get("id"):
-            dropped += 1
-            continue
-
-        release = (tr.get("album") or {}).get("release_date") or ""
-        year = int(release[:4]) if release[:4].isdigit() else None
-
-        rows.append({
-            "id": tr["id"],
-            "name": tr.get("name", "—"),
-            "artist": ", ".join(a.get("name", "") for a in tr.get("artists", [])) or "—",
-            "artist_ids": [a.get("id") for a in tr.get("artists", []) if a.get("id")],
-            "album": (tr.get("album") or {}).get("name", "—"),
-            "release_year": year,
-            "popularity": tr.get("popularity", 0),
-            "url": (tr.get("external_urls") or {}).get("spotify"),
-            "image": ((tr.get("album") or {}).get("images") or [{}])[0].get("url"),
-            "added_at": it.get("added_at"),
-            "added_by": (it.get("added_by") or {}).get("id") or "unknown",
-            "added_by_name": (
-                (it.get("added_by") or {}).get("display_name")
-                or (it.get("added_by") or {}).get("id")
-                or "unknown"
-            ),
-        })
-
-    df = pd.DataFrame(rows).drop_duplicates(subset=["id"]).reset_index(drop=True)
-    return df, dropped
-
-
-@st.cache_data(show_spinner=False, ttl=600)
-def fetch_artists_details(_sp, artist_ids: list[str]) -> pd.DataFrame:
+def playlist_meta(sp, playlist_id: str, market: str = "US"):
+    """Playlist object, uncached so `snapshot_id` is always current."""
+    return spotify_call(sp.playlist, playlist_id, fields=META_FIELDS, market=market)
+
+
+def _fetch_page(sp, playlist_id: str, offset: int, market: str = "US", fields: str = TRACK_PAGE_FIELDS):
+    return spotify_call(sp.playlist_tracks, playlist_id, fields=fields, market=market,
+                        limit=PAGE_LIMIT, offset=offset)
+
+
+def fetch_pages(sp, playlist_id: str, offsets: list[int], market: str = "US", fields: str = TRACK_PAGE_FIELDS) -> list:
+    """Track pages at `offsets`, requested concurrently and returned in the same order."""
+    if len(offsets) <= 1:
+        return [_fetch_page(sp, playlist_id, off, market, fields) for off in offsets]
+    with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, len(offsets))) as pool:
+        # map() yields in submission order, so pages come back in playlist order
+        return list(pool.map(lambda off: _fetch_page(sp, playlist_id, off, market, fields), offsets))
+
+
+def iter_pages(sp, playlist_id: str, offsets: list[int], market: str = "US", fields: str = TRACK_PAGE_FIELDS):
+    """Like `fetch_pages`, but yields (offset, page) in order as soon as each next page lands."""
+    if not offsets:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, len(offsets)))
+    futures = [pool.submit(_fetch_page, sp, playlist_id, off, market, fields) for off in offsets]
+    try:
+        for off, fut in zip(offsets, futures):
+            yield off, fut.result()
+    finally:
+        # consumer stopped early (or a page failed): don't keep fetching pages nobody will read
+        for fut in futures:
+            fut.cancel()
+        pool.shutdown(wait=False)
+
+
+def _artists_frame(artist_ids: list[str], cached: dict, fetched_rows: list[dict]) -> pd.DataFrame:
+    """Stored + freshly fetched rows in request order, with hit/miss counts in `attrs`."""
+    by_id = dict(cached)
+    by_id.update({r["artist_id"]: r for r in fetched_rows if r.get("artist_id")})
+    df = pd.DataFrame([by_id[a] for a in artist_ids if a in by_id])
+    df.attrs["artist_store"] = {"hits": len(cached), "misses": len(artist_ids) - len(cached)}
+    return df
+
+
+def fetch_artists_details(_sp, artist_ids: list[str], rps: float = ARTIST_RPS,
+                          max_workers: int = ARTIST_WORKERS) -> pd.DataFrame:
+    """Artist rows for `artist_ids`; only missing or stale artists hit the API."""
     artist_ids = list(dict.fromkeys([a for a in artist_ids if a]))
-    artists = []
-    for i in range(0, len(artist_ids), 50):
-        chunk = artist_ids[i:i + 50]
-        res = sp.artists(chunk)
-        artists.extend(res.get("artists", []))
-        time.sleep(0.05)
-
-    rows = []
-    for a in artists:
-        rows.append({
-            "artist_id": a.get("id"),
-            "artist_name": a.get("name"),
-            "genres": a.get("genres", []),
-            "artist_popularity": a.get("popularity", 0),
-        })
-
-    return pd.DataFrame(rows)
+    store = get_artist_store()
+    cached, todo = store.get_many(artist_ids)
+
+    chunks = [todo[i:i + ARTIST_CHUNK] for i in range(0, len(todo), ARTIST_CHUNK)]
+    bucket = get_bucket("artists", rps)
+
+    def fetch_chunk(chunk):
+        bucket.acquire()
+        return spotify_call(_sp.artists, chunk).get("artists", [])
+
+    fetched = []
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            for batch in pool.map(fetch_chunk, chunks):
+                fetched.extend(artist_row(a) for a in batch if a)
+        store.put_many(fetched)
+
+    return _artists_frame(artist_ids, cached, fetched)
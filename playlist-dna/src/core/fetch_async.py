@@ -0,0 +1,186 @@
+# src/core/fetch_async.py
+import asyncio
+import threading
+import httpx
+import pandas as pd
+from spotipy.exceptions import SpotifyException
+from src.core.fetch import PAGE_LIMIT, ARTIST_CHUNK, ARTIST_RPS, ARTIST_WORKERS, _artists_frame
+from src.core.rows import TRACK_PAGE_FIELDS, artist_row, json_loads
+from src.core.auth import API_BASE, STATUS_FORCELIST, MAX_THROTTLE_RETRIES
+from src.core.ratelimit import get_bucket
+from src.core.throttle import coordinator, retry_after_seconds
+from src.core.store import get_artist_store
+
+MAX_IN_FLIGHT = 64      # concurrent requests per event loop
+
+
+class AsyncSpotify:
+    """Minimal async Web API client that reuses a sync client's credentials.
+
+    Only the GET endpoints the app reads are needed, so this stays a thin
+    wrapper around one pooled `httpx.AsyncClient`.
+    """
+
+    def __init__(self, auth_manager, max_in_flight: int = MAX_IN_FLIGHT,
+                 timeout: float = 10, retries: int = 3):
+        self.auth_manager = auth_manager
+        self.retries = retries
+        self._sem = asyncio.Semaphore(max_in_flight)
+        self._http = httpx.AsyncClient(
+            base_url=API_BASE,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+        )
+        self._token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._http.aclose()
+
+    async def _auth_header(self, refresh: bool = False) -> dict:
+        if refresh or not self._token:
+            # token endpoint is blocking (and cached) in spotipy; keep it off the loop
+            self._token = await asyncio.to_thread(
+                self.auth_manager.get_access_token, as_dict=False, check_cache=not refresh
+            )
+        return {"Authorization": f"Bearer {self._token}"}
+
+    async def get(self, path: str, refresh: bool = False, **params) -> dict:
+        params = {k: v for k, v in params.items() if v is not None}
+        headers = await self._auth_header(refresh)
+        attempt = throttled = 0
+        while True:
+            await coordinator.wait_async()
+            async with self._sem:
+                resp = await self._http.get(path, params=params, headers=headers)
+            if resp.status_code == 429 and throttled < MAX_THROTTLE_RETRIES:
+                # shared with the sync path: one Retry-After pauses every caller in the process
+                throttled += 1
+                coordinator.report(retry_after_seconds(resp.headers), source=path)
+                continue
+            if resp.status_code in STATUS_FORCELIST and attempt < self.retries:
+                attempt += 1
+                await asyncio.sleep(0.3 * 2 ** attempt)
+                continue
+            break
+        if resp.status_code >= 400:
+            try:
+                msg = resp.json().get("error", {}).get("message", resp.text)
+            except ValueError:
+                msg = resp.text
+            raise SpotifyException(resp.status_code, -1, f"{resp.url}:\n {msg}", headers=dict(resp.headers))
+        return json_loads(resp.content)
+
+
+async def spotify_call_async(client: AsyncSpotify, path: str, **params):
+    """Retry once on 401/403 with a freshly issued token (handles stale token)."""
+    try:
+        return await client.get(path, **params)
+    except SpotifyException as e:
+        if getattr(e, "http_status", None) in (401, 403):
+            return await client.get(path, refresh=True, **params)
+        raise
+
+
+async def fetch_pages_async(client: AsyncSpotify, playlist_id: str, offsets: list[int], market: str = "US",
+                            fields: str = TRACK_PAGE_FIELDS) -> list:
+    path = f"playlists/{playlist_id}/tracks"
+    return list(await asyncio.gather(*[
+        spotify_call_async(client, path, fields=fields, market=market, limit=PAGE_LIMIT, offset=off)
+        for off in offsets
+    ]))
+
+
+async def fetch_artists_details_async(client: AsyncSpotify, artist_ids: list[str], rps: float = ARTIST_RPS,
+                                      max_workers: int = ARTIST_WORKERS) -> pd.DataFrame:
+    artist_ids = list(dict.fromkeys([a for a in artist_ids if a]))
+    store = get_artist_store()
+    # SQLite is blocking I/O: keep it off the event loop
+    cached, todo = await asyncio.to_thread(store.get_many, artist_ids)
+
+    chunks = [todo[i:i + ARTIST_CHUNK] for i in range(0, len(todo), ARTIST_CHUNK)]
+    bucket = get_bucket("artists", rps)
+    sem = asyncio.Semaphore(max(1, max_workers))
+
+    async def fetch_chunk(chunk):
+        async with sem:
+            await bucket.acquire_async()
+            res = await spotify_call_async(client, "artists", ids=",".join(chunk))
+        return res.get("artists", [])
+
+    fetched = []
+    for batch in await asyncio.gather(*[fetch_chunk(c) for c in chunks]):
+        fetched.extend(artist_row(a) for a in batch if a)
+    await asyncio.to_thread(store.put_many, fetched)
+
+    return _artists_frame(artist_ids, cached, fetched)
+
+
+class AsyncSession:
+    """One event loop (on a helper thread) and one AsyncSpotify for a whole
+    `load_playlist` call, with the same call shapes as the sync fetchers in
+    src/core/fetch.py, so the pipeline drives either transport the same way.
+
+        with AsyncSession(sp) as session:
+            for off, page in session.iter_pages(sp, playlist_id, offsets): ...
+    """
+
+    def __init__(self, sp):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="spotify-async", daemon=True)
+        self._thread.start()
+        self.client = self._run(self._open(sp.auth_manager))
+
+    @staticmethod
+    async def _open(auth_manager) -> AsyncSpotify:
+        return AsyncSpotify(auth_manager)  # built on the loop that will drive it
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run(self, coro):
+        return self._submit(coro).result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        async def _shutdown():
+            # pages nobody will read (consumer stopped early, or a page failed)
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.client.__aexit__(None, None, None)
+        self._run(_shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    # --- fetch.py call shapes (`sp` is accepted and unused: the session holds the client) ---
+    def fetch_pages(self, sp, playlist_id: str, offsets: list[int], market: str = "US",
+                    fields: str = TRACK_PAGE_FIELDS) -> list:
+        """Every page in flight on the session's loop; returned in `offsets` order."""
+        return self._run(fetch_pages_async(self.client, playlist_id, offsets, market=market, fields=fields))
+
+    def iter_pages(self, sp, playlist_id: str, offsets: list[int], market: str = "US",
+                   fields: str = TRACK_PAGE_FIELDS):
+        """Every page in flight at once; yields (offset, page) in order as soon as each next page lands."""
+        path = f"playlists/{playlist_id}/tracks"
+        futures = [self._submit(spotify_call_async(self.client, path, fields=fields, market=market,
+                                                   limit=PAGE_LIMIT, offset=off))
+                   for off in offsets]
+        try:
+            for off, fut in zip(offsets, futures):
+                yield off, fut.result()
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    def fetch_artists_details(self, sp, artist_ids: list[str]) -> pd.DataFrame:
+        return self._run(fetch_artists_details_async(self.client, artist_ids))
@@ -0,0 +1,117 @@
+# src/core/genres.py
+"""Genre vocabulary + sparse track × genre incidence matrix.
+
+Built once per analysis. A track "has" a genre when any of its credited
+artists does, so counts are per track (a genre shared by two credited
+artists of the same track counts once). The matrix is CSR over the rows of
+`tracks_df` (indptr/indices, int32), with the vocabulary ordered by track
+count, most common first, so "top K" is a slice.
+"""
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from src.core.model import PlaylistModel
+
+
+class GenreMatrix:
+    """Counts, masks and co-occurrence blocks answered from the CSR arrays,
+    without ever expanding to one row per (track, genre)."""
+
+    def __init__(self, vocab: np.ndarray, indptr: np.ndarray, indices: np.ndarray):
+        self.vocab = vocab                      # genre id -> name
+        self.indptr, self.indices = indptr, indices
+        self.n_tracks, self.n_genres = len(indptr) - 1, len(vocab)
+        self._ids = {g: i for i, g in enumerate(vocab)}
+        self._nnz_rows = np.repeat(np.arange(self.n_tracks, dtype=np.int32), np.diff(indptr))
+        self.track_counts = np.bincount(indices, minlength=self.n_genres)
+
+    # --- lookups ---
+    def ids(self, names) -> np.ndarray:
+        return np.array([self._ids[g] for g in names if g in self._ids], dtype=np.int32)
+
+    def genres_of(self, row: int) -> list[str]:
+        """Genres of one track (by row of tracks_df), most common first."""
+        return self.vocab[np.sort(self.indices[self.indptr[row]:self.indptr[row + 1]])].tolist()
+
+    # --- aggregates ---
+    def counts(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """Tracks per genre id, optionally only over rows where `mask` is True."""
+        if mask is None:
+            return self.track_counts
+        return np.bincount(self.indices[mask[self._nnz_rows]], minlength=self.n_genres)
+
+    def bucket_counts(self, buckets: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+        """Tracks per (genre id, bucket) and genre-less tracks per bucket.
+
+        `buckets` holds a bucket per track row, -1 to leave the row out.
+        """
+        b = buckets[self._nnz_rows]
+        keep = b >= 0
+        flat = np.bincount(self.indices[keep].astype(np.int64) * n_buckets + b[keep],
+                           minlength=self.n_genres * n_buckets)
+        bare = buckets[np.diff(self.indptr) == 0]
+        return flat.reshape(self.n_genres, n_buckets), np.bincount(bare[bare >= 0], minlength=n_buckets)
+
+    def top(self, k: int | None = None, mask: np.ndarray | None = None) -> pd.DataFrame:
+        """[genre, count] for the k most common genres (ties: overall frequency)."""
+        counts = self.counts(mask)
+        order = np.argsort(-counts, kind="stable")  # vocab is already in overall order
+        order = order[counts[order] > 0][:k]
+        return pd.DataFrame({"genre": self.vocab[order], "count": counts[order]})
+
+    def any_of(self, names) -> np.ndarray:
+        """Bool mask over tracks having at least one of `names`."""
+        mask = np.zeros(self.n_tracks, dtype=bool)
+        mask[self._nnz_rows[np.isin(self.indices, self.ids(names))]] = True
+        return mask
+
+    def dense(self, names) -> np.ndarray:
+        """n_tracks × len(names) bool block for a handful of genres."""
+        ids = self.ids(names)
+        col = np.full(self.n_genres, -1)
+        col[ids] = np.arange(len(ids))
+        out = np.zeros((self.n_tracks, len(ids)), dtype=bool)
+        hit = col[self.indices] >= 0
+        out[self._nnz_rows[hit], col[self.indices[hit]]] = True
+        return out
+
+    def cooccurrence(self, names) -> pd.DataFrame:
+        """Tracks carrying both genres, for every pair of `names` (diagonal = track counts)."""
+        block = self.dense(names).astype(np.int32)
+        labels = self.vocab[self.ids(names)]
+        return pd.DataFrame(block.T @ block, index=labels, columns=labels)
+
+
+def build_genre_matrix(model: PlaylistModel) -> GenreMatrix:
+    """Artist genres pushed through the credits bridge onto the model's track rows."""
+    n = model.n_tracks
+    artist_genres = model.artists["genres"]
+    glens = np.fromiter((len(g) for g in artist_genres), dtype=np.int64, count=len(artist_genres))
+    codes, names = pd.factorize(pd.Series(list(chain.from_iterable(artist_genres)), dtype=object))
+    n_genres = max(len(names), 1)
+    if n == 0 or len(names) == 0:
+        return GenreMatrix(np.asarray(names, dtype=object), np.zeros(n + 1, dtype=np.int32),
+                           np.array([], dtype=np.int32))
+
+    # every (credit, genre of the credited artist) pair, gathered by position
+    a_start = np.cumsum(glens) - glens
+    credit_artist = model.credits["artist"].to_numpy()
+    lens = glens[credit_artist]
+    within = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+    genre_codes = codes[np.repeat(a_start[credit_artist], lens) + within]
+    rows = np.repeat(model.credits["track"].to_numpy().astype(np.int64), lens)
+
+    # unique (track row, genre) pairs, sorted by row then genre
+    keys = np.unique(rows * n_genres + genre_codes)
+    track_rows, genre_ids = keys // n_genres, keys % n_genres
+
+    # renumber genres by descending track count
+    order = np.argsort(-np.bincount(genre_ids, minlength=len(names)), kind="stable")
+    rank = np.empty(len(names), dtype=np.int32)
+    rank[order] = np.arange(len(names), dtype=np.int32)
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(track_rows, minlength=n), out=indptr[1:])
+    return GenreMatrix(np.asarray(names, dtype=object)[order], indptr, rank[genre_ids])
@@ -0,0 +1,100 @@
+# src/core/model.py
+"""Normalized playlist model: tracks, artists and an integer credits bridge.
+
+Replaces the exploded `enriched` frame (every track column repeated once
+per credited artist). Tables, all with a RangeIndex:
+  tracks   one row per track (tracks_df as built by rows.tracks_frame)
+  artists  one row per credited artist: artist_id, artist_name, genres, artist_popularity
+  credits  track (int32 row of tracks), artist (int32 row of artists),
+           position (int8, credit order) and is_lead (position == 0)
+
+Joins go through integer positions, never through merges on ids.
+"""
+import numpy as np
+import pandas as pd
+
+ARTIST_COLUMNS = ("artist_id", "artist_name", "genres", "artist_popularity")
+
+
+class PlaylistModel:
+    """The three tables plus `lead`, the artist row of each track's lead credit,
+    which the per-track lookups and lead-artist counts index into."""
+
+    def __init__(self, tracks: pd.DataFrame, artists: pd.DataFrame, credits: pd.DataFrame):
+        self.tracks, self.artists, self.credits = tracks, artists, credits
+        lead = credits[credits["is_lead"]]
+        self.lead = np.full(len(tracks), -1, dtype=np.int32)  # artist row of each track's lead credit
+        self.lead[lead["track"].to_numpy()] = lead["artist"].to_numpy()
+
+    @property
+    def n_tracks(self) -> int:
+        return len(self.tracks)
+
+    # --- index-based joins ---
+    def artist_values(self, column: str, rows: np.ndarray) -> np.ndarray:
+        """`artists[column]` at artist rows; -1 rows give None."""
+        values = self.artists[column].to_numpy(dtype=object)
+        out = np.full(len(rows), None, dtype=object)
+        ok = rows >= 0
+        out[ok] = values[rows[ok]]
+        return out
+
+    def lead_artist(self) -> pd.Series:
+        """Lead artist name per track (aligned with `tracks`)."""
+        return pd.Series(self.artist_values("artist_name", self.lead), index=self.tracks.index, name="lead_artist")
+
+    # --- aggregates ---
+    def artist_counts(self, lead_only: bool = True, mask: np.ndarray | None = None) -> pd.DataFrame:
+        """[artist, count] by tracks, most credited first; `mask` selects tracks."""
+        if lead_only:
+            rows = self.lead if mask is None else self.lead[mask]
+            rows = rows[rows >= 0]
+        else:
+            t, rows = self.credits["track"].to_numpy(), self.credits["artist"].to_numpy()
+            if mask is not None:
+                rows = rows[mask[t]]
+        counts = np.bincount(rows, minlength=len(self.artists))
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return pd.DataFrame({"artist": self.artists["artist_name"].to_numpy(dtype=object)[order],
+                             "count": counts[order]})
+
+    def n_credited_artists(self) -> int:
+        return int(self.artists["artist_name"].nunique())
+
+
+def build_model(tracks_df: pd.DataFrame, artists_df: pd.DataFrame) -> PlaylistModel:
+    """Tracks frame + fetched artist rows → normalized model (artists missing from
+    `artists_df` keep the name from the track's credit string and no genres)."""
+    ids = tracks_df["artist_ids"] if "artist_ids" in tracks_df else pd.Series([[]] * len(tracks_df))
+    lens = np.fromiter((len(x) if isinstance(x, list) else 0 for x in ids), dtype=np.int64, count=len(ids))
+    flat = [a for x in ids if isinstance(x, list) for a in x]
+
+    codes, uniques = pd.factorize(pd.Series(flat, dtype=object))
+    track_rows = np.repeat(np.arange(len(tracks_df), dtype=np.int32), lens)
+    starts = np.repeat(np.cumsum(lens) - lens, lens)
+    position = (np.arange(len(flat)) - starts).astype(np.int8)
+    credits = pd.DataFrame({
+        "track": track_rows,
+        "artist": codes.astype(np.int32),
+        "position": position,
+        "is_lead": position == 0,
+    })
+
+    artists = pd.DataFrame({"artist_id": pd.Series(uniques, dtype=object)})
+    if not artists_df.empty:
+        artists = artists.merge(artists_df.drop_duplicates("artist_id"), on="artist_id", how="left")
+    for col in ARTIST_COLUMNS[1:]:
+        if col not in artists:
+            artists[col] = None
+    # fallback names: the credit string is the artists' names joined with ", "
+    missing = artists["artist_name"].isna().to_numpy()
+    if missing.any():
+        names = {}
+        for lst, label in zip(ids, tracks_df["artist"]):
+            parts = str(label).split(", ")
+            if isinstance(lst, list) and len(parts) == len(lst):
+                names.update(zip(lst, parts))
+        artists.loc[missing, "artist_name"] = artists.loc[missing, "artist_id"].map(names)
+    artists["genres"] = [g if isinstance(g, list) else [] for g in artists["genres"]]
+    return PlaylistModel(tracks_df.reset_index(drop=True), artists[list(ARTIST_COLUMNS)], credits)
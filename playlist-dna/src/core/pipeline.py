@@ -0,0 +1,172 @@
+# src/core/pipeline.py
+import pandas as pd
+from src.core.bundle import build_bundle
+from src.core.compact import COMPACT_FRAMES, compact_frame, frames_footprint
+from src.core.genres import build_genre_matrix
+from src.core.model import PlaylistModel, build_model
+from src.core.fetch import PAGE_LIMIT, playlist_meta, fetch_pages, iter_pages, fetch_artists_details
+from src.core.search import build_search_index
+from src.core.rows import FINGERPRINT_FIELDS, build_columns, concat_columns, take_unseen, tracks_frame, page_fingerprint
+from src.core.singleflight import SingleFlight
+from src.core.store import get_snapshot_store
+
+# One in-flight analysis per (playlist_id, market), shared by every session in the process
+_analyses = SingleFlight()
+
+
+def _noop(*args):
+    pass
+
+
+def _tables(model: PlaylistModel) -> dict:
+    return {"tracks": model.tracks, "artists": model.artists, "credits": model.credits}
+
+
+def load_playlist(sp, playlist_id: str, market: str = "US", use_async: bool = False,
+                  on_stage=_noop, on_batch=_noop) -> dict:
+    """Meta, tracks and the normalized model for a playlist, streamed page by page.
+
+    Snapshots are keyed by (playlist_id, snapshot_id, market):
+      - unchanged snapshot → tracks come straight from disk (no track-page calls)
+      - changed snapshot   → cheap id-only fingerprints of every page, then full
+                             fetches only for pages whose fingerprint moved
+      - nothing stored     → every page is fetched
+    Artists always go through the artist store, so only new/stale ones hit the API.
+
+    Pages are consumed in playlist order as they land, over the thread-pool
+    transport (src/core/fetch.py) or, with `use_async`, one event loop and
+    HTTP pool kept for the whole call (src/core/fetch_async.py). After each batch,
+    `on_batch(progress)` receives {"items_done", "total", "tracks", "artists"}:
+    the per-batch track frames so far and the artist rows fetched so far.
+
+    "model" is the tracks/artists/credits model (src/core/model.py) and
+    "genres" its track × genre incidence matrix (src/core/genres.py), and
+    "bundle" the aggregates every view reads (src/core/bundle.py), built once
+    for (playlist_id, snapshot_id, market), and "search" the track search
+    index (src/core/search.py).
+    With PLAYLIST_DNA_COMPACT on, the model tables use the compact schema
+    (src/core/compact.py); "memory" holds their footprint before/after.
+
+    Returns {"meta", "tracks_df", "model", "dropped", "refresh", "artist_store", "memory", "genres",
+    "bundle", "search"}.
+    """
+    if not use_async:
+        return _load(sp, playlist_id, market, fetch_pages, iter_pages, fetch_artists_details, on_stage, on_batch)
+    from src.core.fetch_async import AsyncSession
+    with AsyncSession(sp) as session:
+        return _load(sp, playlist_id, market, session.fetch_pages, session.iter_pages,
+                     session.fetch_artists_details, on_stage, on_batch)
+
+
+def _load(sp, playlist_id, market, get_pages, stream_pages, get_artists, on_stage, on_batch) -> dict:
+    on_stage("Fetching metadata…")
+    meta = playlist_meta(sp, playlist_id, market=market)
+    snapshot_id = meta.get("snapshot_id")
+    total = int((meta.get("tracks") or {}).get("total") or 0)
+    offsets = list(range(0, total, PAGE_LIMIT))
+
+    store = get_snapshot_store()
+    prev = store.load(playlist_id, market)
+
+    kept = {}
+    if prev and snapshot_id and prev["snapshot_id"] == snapshot_id:
+        kept, refresh = prev["pages"], "unchanged"
+    else:
+        if prev:
+            on_stage("Checking which pages changed…")
+            fps = get_pages(sp, playlist_id, offsets, market=market, fields=FINGERPRINT_FIELDS)
+            for off, page in zip(offsets, fps):
+                old = prev["pages"].get(off)
+                if old and old["fp"] == page_fingerprint(page.get("items", [])):
+                    kept[off] = old
+        refresh = "incremental" if kept else "full"
+    todo = [off for off in offsets if off not in kept]
+
+    on_stage(f"Fetching tracks ({len(todo)} of {len(offsets)} pages)…")
+    fetched = stream_pages(sp, playlist_id, todo, market=market)
+
+    pages, seen, pending = {}, set(), []
+    track_batches = []
+    artists_df, requested = pd.DataFrame(), set()
+    store_stats = {"hits": 0, "misses": 0}
+    progress = {"items_done": 0, "total": total, "tracks": track_batches, "artists": artists_df}
+    reported = 0
+
+    def flush():
+        nonlocal artists_df, reported
+        cols = take_unseen(concat_columns(pending), seen) if pending else None  # dedupe across pages
+        pending.clear()
+        if cols and cols["id"]:
+            batch = tracks_frame(cols)
+            new_ids = list(dict.fromkeys(aid for lst in batch["artist_ids"] for aid in (lst or []) if aid not in requested))
+            if new_ids:
+                requested.update(new_ids)
+                fresh = get_artists(sp, new_ids)
+                for k, v in fresh.attrs.get("artist_store", {}).items():
+                    store_stats[k] += v
+                if not fresh.empty:
+                    artists_df = pd.concat([artists_df, fresh], ignore_index=True)
+            track_batches.append(batch)
+            progress["artists"] = artists_df
+        if progress["items_done"] != reported:
+            reported = progress["items_done"]
+            on_batch(progress)
+
+    for off in offsets:
+        page = kept.get(off)
+        if page is None:
+            flush()  # paint stored pages we already have before waiting on the network
+            _, raw = next(fetched)
+            items = raw.get("items", [])
+            cols, dropped = build_columns(items)
+            page = {"fp": page_fingerprint(items), "cols": cols, "dropped": dropped}
+        pages[off] = page
+        pending.append(page["cols"])
+        progress["items_done"] += len(page["cols"]["id"]) + page["dropped"]
+        if off not in kept:
+            flush()
+    flush()
+
+    if snapshot_id and refresh != "unchanged":
+        store.save(playlist_id, market, {"snapshot_id": snapshot_id, "total": total, "pages": pages})
+
+    tracks_df = pd.concat(track_batches, ignore_index=True) if track_batches else pd.DataFrame()
+    model = build_model(tracks_df, artists_df)
+    genres = build_genre_matrix(model)
+    memory = {"before": frames_footprint(_tables(model)), "compact": COMPACT_FRAMES}
+    if COMPACT_FRAMES:
+        model = PlaylistModel(compact_frame(model.tracks), compact_frame(model.artists), model.credits)
+        memory["after"] = frames_footprint(_tables(model))
+    tracks_df = model.tracks
+    bundle = build_bundle((playlist_id, snapshot_id, market), model, genres)
+    return {
+        "meta": meta,
+        "tracks_df": tracks_df,
+        "model": model,
+        "dropped": sum(p["dropped"] for p in pages.values()),
+        "refresh": refresh,
+        "artist_store": store_stats,
+        "memory": memory,
+        "genres": genres,
+        "bundle": bundle,
+        "search": build_search_index(tracks_df),
+    }
+
+
+def load_playlist_shared(sp, playlist_id: str, market: str = "US", use_async: bool = False,
+                         on_stage=_noop, on_batch=_noop) -> dict:
+    """`load_playlist`, deduplicated across sessions.
+
+    If another session is already analyzing the same (playlist_id, market),
+    wait for it and reuse its result instead of issuing the same upstream
+    calls again (only the leader sees batches). Everything returned (frames,
+    model, genre matrix, bundle, search index) is shared between sessions and
+    never modified after load_playlist builds it: treat it as read-only.
+    pandas copy-on-write keeps the slices views take from writing back.
+    """
+    result, shared = _analyses.do(
+        (playlist_id, market), load_playlist, sp, playlist_id,
+        market=market, use_async=use_async, on_stage=on_stage, on_batch=on_batch,
+        on_wait=lambda: on_stage("Waiting for an in-flight analysis of this playlist…"),
+    )
+    return dict(result, shared=shared)
@@ -0,0 +1,55 @@
+# src/core/ratelimit.py
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills at `rate` tokens/sec, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float) -> float:
+        """Take `tokens` if available (returns 0.0), else the seconds until they will be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while (delay := self._take(tokens)) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Async counterpart of `acquire`; yields to the event loop while waiting."""
+        waited = 0.0
+        while (delay := self._take(tokens)) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name: str, rate: float, capacity: float | None = None) -> TokenBucket:
+    """Process-wide bucket by name, shared across sessions and worker threads."""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None or bucket.rate != float(rate):
+            bucket = _buckets[name] = TokenBucket(rate, capacity)
+        return bucket
@@ -0,0 +1,110 @@
+# src/core/rows.py
+"""Row builders for Spotify payloads, plus the `fields` projections that feed them.
+
+The projections below request exactly the keys the builders read; change
+them together.
+"""
+import json
+
+import pandas as pd
+
+try:  # several times faster on large track pages; stdlib json otherwise
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# One playlist item, as read by build_columns / page_fingerprint
+ITEM_FIELDS = (
+    "added_at,added_by(id,display_name),"
+    "track(type,id,is_local,name,popularity,external_urls(spotify),"
+    "artists(id,name),album(name,release_date,images(url)))"
+)
+TRACK_PAGE_FIELDS = f"total,limit,offset,next,items({ITEM_FIELDS})"
+FINGERPRINT_FIELDS = "total,items(added_at,track(id))"
+# Playlist header (the embedded first tracks page is skipped; only its total is kept)
+META_FIELDS = "id,name,snapshot_id,owner(display_name),images(url),external_urls(spotify),tracks(total)"
+
+# Columns produced by build_columns, in frame order
+TRACK_COLUMNS = ("id", "name", "artist", "artist_ids", "album", "release_year", "popularity",
+                 "url", "image", "added_at", "added_by", "added_by_name")
+
+
+def page_fingerprint(items: list) -> tuple:
+    """(added_at, track id) per item — enough to tell whether a stored page is still current."""
+    return tuple(((it or {}).get("added_at"), ((it or {}).get("track") or {}).get("id")) for it in items)
+
+
+def build_columns(items: list):
+    """Turn raw playlist items into per-column lists; returns (columns, dropped).
+
+    One pass, appending straight into the column lists (no per-track dict).
+    `tracks_frame` turns the result into a typed frame.
+    """
+    cols = {c: [] for c in TRACK_COLUMNS}
+    (ids, names, artist, artist_ids, album, release_year, popularity,
+     url, image, added_at, added_by, added_by_name) = cols.values()
+    dropped = 0
+    for it in items:
+        tr = it.get("track") if it else None
+        if not tr or tr.get("type") != "track" or tr.get("is_local") or not tr.get("id"):
+            dropped += 1
+            continue
+
+        alb = tr.get("album") or {}
+        credits = tr.get("artists") or []
+        by = it.get("added_by") or {}
+        year = (alb.get("release_date") or "")[:4]
+        images = alb.get("images")
+
+        ids.append(tr["id"])
+        names.append(tr.get("name", "—"))
+        artist.append(", ".join(a.get("name", "") for a in credits) or "—")
+        artist_ids.append([a["id"] for a in credits if a.get("id")])
+        album.append(alb.get("name", "—"))
+        release_year.append(int(year) if year.isdigit() else None)
+        popularity.append(tr.get("popularity", 0))
+        url.append((tr.get("external_urls") or {}).get("spotify"))
+        image.append(images[0].get("url") if images else None)
+        added_at.append(it.get("added_at"))
+        by_id = by.get("id")
+        added_by.append(by_id or "unknown")
+        added_by_name.append(by.get("display_name") or by_id or "unknown")
+    return cols, dropped
+
+
+def concat_columns(batches: list[dict]) -> dict:
+    if len(batches) == 1:
+        return batches[0]
+    return {c: [v for b in batches for v in b[c]] for c in TRACK_COLUMNS}
+
+
+def take_unseen(cols: dict, seen: set) -> dict:
+    """Only the rows whose track id is not in `seen` (first occurrence wins); updates `seen`."""
+    keep = []
+    for i, tid in enumerate(cols["id"]):
+        if tid not in seen:
+            seen.add(tid)
+            keep.append(i)
+    if len(keep) == len(cols["id"]):
+        return cols
+    return {c: [v[i] for i in keep] for c, v in cols.items()}
+
+
+def tracks_frame(cols: dict) -> pd.DataFrame:
+    """Typed tracks frame: nullable ints for year/popularity, `added_at` parsed once (UTC)."""
+    return pd.DataFrame({
+        **cols,
+        "release_year": pd.array(cols["release_year"], dtype="Int64"),
+        "popularity": pd.array(cols["popularity"], dtype="Int64"),
+        "added_at": pd.to_datetime(cols["added_at"], format="ISO8601", utc=True, errors="coerce"),
+    }, columns=list(TRACK_COLUMNS))
+
+
+def artist_row(a: dict) -> dict:
+    return {
+        "artist_id": a.get("id"),
+        "artist_name": a.get("name"),
+        "genres": a.get("genres", []),
+        "artist_popularity": a.get("popularity", 0),
+    }
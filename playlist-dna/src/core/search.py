@@ -0,0 +1,198 @@
+# src/core/search.py
+"""Per-analysis search index over track name, artist and album.
+
+Built once at the end of load_playlist; a keystroke never scans the playlist:
+  - text is normalized (accents stripped, casefolded) and split into tokens
+  - the token vocabulary is sorted, so every token a query word is a prefix
+    of is one contiguous range found by binary search
+  - a word no token starts with is treated as a typo: a trigram index over
+    the vocabulary proposes candidates, verified with a bounded edit
+    distance (transpositions count as one edit)
+  - postings (CSR over tokens) hold each track row once per token with a
+    bitmask of the fields it appears in
+Every query word must match (exactly, as a prefix or within the typo
+budget). A word scores its match quality times its best field weight
+(name > artist > album); words that all land in one field earn that field's
+weight again ("artist 42" prefers the artist over a song called "42"). Rows
+are ranked by score, then playlist order.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("name", "artist", "album")  # bit i of a field mask
+FIELD_WEIGHTS = np.array([3, 2, 1])
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6  # match quality, times the field weight
+_BEST_WEIGHT = np.array([max([w for i, w in enumerate(FIELD_WEIGHTS) if m >> i & 1], default=0)
+                         for m in range(1 << len(FIELDS))])
+_TOKEN = re.compile(r"\w+")
+_TOP = "\U0010ffff"  # sorts after every token sharing a prefix
+
+
+def normalize(text) -> str:
+    """Casefolded text without accents ("Beyoncé" -> "beyonce")."""
+    text = str(text)
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text) -> list[str]:
+    return _TOKEN.findall(normalize(text)) if isinstance(text, str) else []
+
+
+def _grams(token: str) -> set[str]:
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(token: str) -> int:
+    return 0 if len(token) < 4 else 1 if len(token) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it must exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                d = min(d, before[j - 2] + 1)
+            cur.append(d)
+        if min(cur) > limit:
+            return limit + 1
+        before, prev = prev, cur
+    return prev[-1]
+
+
+def _csr(keys: np.ndarray, n_keys: int, *values: np.ndarray):
+    """Group `values` by integer `keys` → (indptr, *values sorted by key)."""
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n_keys + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=indptr[1:])
+    return (indptr, *(v[order] for v in values))
+
+
+class SearchIndex:
+    """Token postings and a trigram index over the vocabulary; `search` ranks track rows."""
+
+    def __init__(self, labels: np.ndarray, vocab: np.ndarray, postings: tuple, grams: tuple):
+        self.labels = labels                    # "Song — Artist" per track row
+        self.n_tracks = len(labels)
+        self.vocab = vocab                      # sorted tokens
+        self.indptr, self.rows, self.masks = postings
+        self._gram_ids, self.gram_indptr, self.gram_tokens = grams
+
+    # --- token matching ---
+    def _prefix_range(self, word: str) -> tuple[int, int]:
+        return (int(np.searchsorted(self.vocab, word, "left")),
+                int(np.searchsorted(self.vocab, word + _TOP, "left")))
+
+    def _typo_tokens(self, word: str) -> list[tuple[int, int]]:
+        """(token id, distance) for tokens within the typo budget of `word`,
+        either whole or cut to the word's length (a typo in a word being typed)."""
+        limit = max_typos(word)
+        if not limit:
+            return []
+        grams = [self._gram_ids[g] for g in _grams(word) if g in self._gram_ids]
+        if not grams:
+            return []
+        hits = np.concatenate([self.gram_tokens[self.gram_indptr[g]:self.gram_indptr[g + 1]] for g in grams])
+        shared = np.bincount(hits, minlength=len(self.vocab))
+        # an edit changes at most 3 trigrams of the word (a transposition 4)
+        out = []
+        for t in np.flatnonzero(shared >= max(1, len(_grams(word)) - 4 * limit)):
+            tok = self.vocab[t]
+            d = min(edit_distance(word, tok, limit), edit_distance(word, tok[:len(word)], limit))
+            if d <= limit:
+                out.append((int(t), d))
+        return out
+
+    def _word_scores(self, word: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, best score per row, fields matched per row) for one query word."""
+        lo, hi = self._prefix_range(word)
+        if lo < hi:
+            # the prefix range is one contiguous block of postings
+            a, b = self.indptr[lo], self.indptr[hi]
+            rows, masks = self.rows[a:b], self.masks[a:b]
+            quality = np.full(b - a, PREFIX)
+            if self.vocab[lo] == word:  # an exact match sorts first in its range
+                quality[:self.indptr[lo + 1] - a] = EXACT
+        else:
+            typos = self._typo_tokens(word)
+            if not typos:
+                return np.array([], dtype=np.int32), np.array([]), np.array([], dtype=np.int8)
+            spans = [(self.indptr[t], self.indptr[t + 1]) for t, _ in typos]
+            rows = np.concatenate([self.rows[a:b] for a, b in spans])
+            masks = np.concatenate([self.masks[a:b] for a, b in spans])
+            quality = np.concatenate([np.full(b - a, FUZZY - 0.1 * (d - 1)) for (a, b), (_, d) in zip(spans, typos)])
+        scores = _BEST_WEIGHT[masks] * quality
+        order = np.lexsort((-scores, rows))  # per row, best score first
+        rows, scores, masks = rows[order], scores[order], masks[order]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        return rows[starts], scores[starts], np.bitwise_or.reduceat(masks, starts)
+
+    # --- queries ---
+    def search(self, query: str, limit: int = 10) -> np.ndarray:
+        """Best matching track rows; every word must match. Empty query: playlist order."""
+        words = tokenize(query)
+        if not words:
+            return np.arange(min(limit, self.n_tracks))
+        rows = total = common = None
+        for word in dict.fromkeys(words):
+            r, s, m = self._word_scores(word)
+            if rows is None:
+                rows, total, common = r, s, m
+            else:
+                keep, a, b = np.intersect1d(rows, r, assume_unique=True, return_indices=True)
+                rows, total, common = keep, total[a] + s[b], common[a] & m[b]
+            if not len(rows):
+                break
+        total = total + _BEST_WEIGHT[common]
+        order = np.lexsort((rows, -total))[:limit]
+        return rows[order]
+
+
+def build_search_index(tracks_df: pd.DataFrame) -> SearchIndex:
+    n = len(tracks_df)
+    names = tracks_df["name"].astype(object).fillna("—").to_numpy() if n else np.array([], dtype=object)
+    artists = tracks_df["artist"].astype(object).fillna("—").to_numpy() if n else names
+    labels = np.array([f"{a} — {b}" for a, b in zip(names, artists)], dtype=object)
+
+    # one (token, row, field bit) per distinct token of each field value
+    toks, rows, bits, cache = [], [], [], {}
+    for i, field in enumerate(FIELDS):
+        if field not in tracks_df:
+            continue
+        for row, text in enumerate(tracks_df[field].astype(object).to_numpy()):
+            found = cache.get(text)
+            if found is None:
+                found = cache[text] = list(dict.fromkeys(tokenize(text)))
+            toks.extend(found)
+            rows.extend([row] * len(found))
+            bits.extend([1 << i] * len(found))
+    codes, uniques = pd.factorize(pd.Series(toks, dtype=object))
+    vocab = np.array(sorted(uniques), dtype=object)
+    codes = np.searchsorted(vocab, np.asarray(uniques, dtype=object))[codes] if len(toks) else codes
+    # merge fields per (token, row): bits are distinct, so their sum is the mask
+    pairs, inverse = np.unique(codes.astype(np.int64) * max(n, 1) + np.asarray(rows, dtype=np.int64),
+                               return_inverse=True)
+    masks = np.bincount(inverse, weights=bits, minlength=len(pairs)).astype(np.int8)
+    keys = (pairs // max(n, 1)).astype(np.int32)
+    postings = _csr(keys, len(vocab), (pairs % max(n, 1)).astype(np.int32), masks)
+
+    # trigram → tokens, for typo candidates
+    gram_ids, gram_keys, gram_tokens = {}, [], []
+    for i, tok in enumerate(vocab):
+        for g in _grams(tok):
+            gram_keys.append(gram_ids.setdefault(g, len(gram_ids)))
+            gram_tokens.append(i)
+    grams = (gram_ids, *_csr(np.array(gram_keys, dtype=np.int32), len(gram_ids),
+                             np.array(gram_tokens, dtype=np.int32)))
+    return SearchIndex(labels, vocab, postings, grams)
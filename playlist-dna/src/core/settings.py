@@ -0,0 +1,16 @@
+# src/core/settings.py
+import os
+import streamlit as st
+
+
+def get_setting(name: str, default=None):
+    """Streamlit secret, else environment variable, else `default`.
+
+    Local runs (stand-in server, benchmarks, load tests) usually have no
+    secrets.toml, and `st.secrets` raises in that case instead of returning None.
+    """
+    try:
+        value = st.secrets.get(name)
+    except Exception:
+        value = None
+    return value or os.getenv(name) or default
@@ -0,0 +1,52 @@
+# src/core/singleflight.py
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller (the leader) runs `fn`; callers arriving while it is in
+    flight block and receive the leader's result (or exception). Nothing is
+    kept once the call finishes, so later callers start a fresh run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key, fn, *args, on_wait=None, **kwargs):
+        """Returns (result, shared) where `shared` is True for callers that waited on a leader."""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                try:
+                    call.result = fn(*args, **kwargs)
+                    return call.result, False
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        self._calls.pop(key, None)
+                    call.done.set()
+
+            if on_wait:
+                on_wait()
+            call.done.wait()
+            if call.error is None:
+                return call.result, True
+            if isinstance(call.error, Exception):
+                raise call.error
+            # Leader was interrupted (e.g. its Streamlit session reran or stopped): try again ourselves
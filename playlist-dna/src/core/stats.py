@@ -1,16 +1,18 @@
 # src/core/stats.py
 from __future__ import annotations
-import os
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any
 import pandas as pd
 import streamlit as st
+from src.core.settings import get_setting
+from src.core.bundle import AnalysisBundle
+from src.core.timeline import dates
 
 
 # ------------------------- Snapshot stats ------------------------- #
 
-def compute_stats(tracks_df: pd.DataFrame, enriched: pd.DataFrame) -> Dict[str, Any]:
+def compute_stats(bundle: AnalysisBundle) -> Dict[str, Any]:
     """
-    Compute snapshot stats for the current playlist state.
+    Snapshot stats for the current playlist state, read off the analysis bundle.
     Returns:
         {
           "top_genres": List[(genre, pct_int)],
@@ -19,38 +21,29 @@ def compute_stats(tracks_df: pd.DataFrame, enriched: pd.DataFrame) -> Dict[str,
           "median_pop": float
         }
     """
-    # Top genres (percentage by occurrences in exploded genres)
-    g = enriched.explode("genres")["genres"].dropna()
-    top_genres_counts = g.value_counts()
-    total = int(top_genres_counts.sum()) or 1
-    top_genres_pct = [(k, int(round(v * 100 / total))) for k, v in top_genres_counts.items()]
+    # Top genres (percentage of all track-genre tags)
+    top = bundle.top_genres()
+    total = int(top["count"].sum()) or 1
+    top_genres_pct = [(k, int(round(v * 100 / total))) for k, v in zip(top["genre"], top["count"])]
 
     # Lead artists (by first listed artist)
-    lead = enriched.copy()
-    lead["lead_artist"] = lead["artist"].str.split(", ").str[0]
-    top_artists = list(lead["lead_artist"].value_counts().head(10).items())
-
-    # Decades
-    td = tracks_df.dropna(subset=["release_year"]).copy()
-    td["decade"] = (td["release_year"] // 10) * 10
-    decades = td["decade"].value_counts().sort_index().to_dict()
-
-    # Popularity (median)
-    median_pop = float(tracks_df["popularity"].median()) if not tracks_df.empty else 0.0
+    lead = bundle.top_artists(10)
+    top_artists = [(a, int(n)) for a, n in zip(lead["artist"], lead["count"])]
 
     return {
         "top_genres": top_genres_pct,
         "top_artists": top_artists,
-        "decades": decades,
-        "median_pop": median_pop,
+        "decades": dict(zip(bundle.decades["decade"].tolist(), bundle.decades["count"].tolist())),
+        "median_pop": bundle.median_popularity,
     }
 
 
 # ----------------------- Evolution over time ---------------------- #
 
-def compute_evolution_stats(tracks_df: pd.DataFrame, enriched: pd.DataFrame) -> Optional[Dict[str, Any]]:
+def compute_evolution_stats(tracks_df: pd.DataFrame, bundle: AnalysisBundle) -> Optional[Dict[str, Any]]:
     """
     Summarize how the playlist evolved using `added_at` timestamps.
+    Calendar keys, ages at add and genre trends come precomputed from `bundle`.
 
     Returns None if no `added_at` data is available, else:
         {
@@ -62,68 +55,37 @@ def compute_evolution_stats(tracks_df: pd.DataFrame, enriched: pd.DataFrame) ->
           "bursts_top": List[(date_str, count_int)],
           "median_age_years": Optional[float],
           "rising_genres": List[(genre, +share_float)],
-          "falling_genres": List[(genre, -share_float)]
+          "falling_genres": List[(genre, -share_float)],
+          "genre_shifts": List[(genre, "YYYY-MM", share_before, share_after)]
         }
+    Genre shares are of the tracks added in the first vs last TREND_WINDOW
+    months; shifts are the detected change points, biggest first.
     """
-    if "added_at" not in tracks_df or tracks_df["added_at"].isna().all():
+    times = bundle.times
+    if times.empty:
         return None
 
-    t = tracks_df.dropna(subset=["added_at"]).copy()
-    # Normalize times to naive for grouping
-    t["date"] = t["added_at"].dt.tz_convert(None).dt.date
-    t["month"] = t["added_at"].dt.tz_convert(None).dt.to_period("M").dt.to_timestamp()
-
-    # Growth basics
-    per_day = t.groupby("date").size().reset_index(name="added").sort_values("date")
-    total_tracks = int(t["id"].nunique())
-    first_date = per_day["date"].min()
-    last_date = per_day["date"].max()
-    days_span = (pd.to_datetime(last_date) - pd.to_datetime(first_date)).days or 1
-    adds_per_day = float(per_day["added"].mean())
+    # Growth basics (days are epoch-day ints)
+    per_day = times["day"].value_counts().sort_index()
+    total_tracks = int(tracks_df["id"].iloc[times.index].nunique())
+    first_day, last_day = int(per_day.index[0]), int(per_day.index[-1])
+    first_date, last_date = dates([first_day, last_day])
+    days_span = (last_day - first_day) or 1
+    adds_per_day = float(per_day.mean())
 
     # Bursts
-    bursts = per_day.sort_values("added", ascending=False).head(3)
-    bursts_summary = [(str(d), int(n)) for d, n in zip(bursts["date"], bursts["added"])]
+    bursts = per_day.sort_values(ascending=False, kind="stable").head(3)
+    bursts_summary = [(str(d), int(n)) for d, n in zip(dates(bursts.index), bursts)]
 
     # Novelty: age (years) at add time
-    td = t.dropna(subset=["release_year"]).copy()
-    if not td.empty:
-        td["added_year"] = td["added_at"].dt.tz_convert(None).dt.year
-        td["age_years"] = td["added_year"] - td["release_year"]
-        median_age = float(td["age_years"].median())
-    else:
-        median_age = None
-
-    # Genre shift: early vs late month shares for top genres
-    g = enriched.dropna(subset=["added_at"]).copy()
-    g["month"] = g["added_at"].dt.tz_convert(None).dt.to_period("M").dt.to_timestamp()
-    g = g.explode("genres")
-    g["genres"] = g["genres"].fillna("unknown")
+    ages = bundle.track_facts["age_at_add"].dropna()
+    median_age = float(ages.median()) if not ages.empty else None
 
-    if g.empty:
-        rising = []
-        falling = []
-    else:
-        topK = g["genres"].value_counts().head(8).index.tolist()
-        g = g[g["genres"].isin(topK)]
-        early = g[g["month"] <= (g["month"].min() + pd.offsets.MonthEnd(1))]
-        late = g[g["month"] >= (g["month"].max() - pd.offsets.MonthEnd(1))]
-
-        def norm_share(df: pd.DataFrame) -> pd.Series:
-            tmp = df.groupby("genres").size().reset_index(name="count")
-            s = int(tmp["count"].sum()) or 1
-            tmp["share"] = tmp["count"] / s
-            return tmp.set_index("genres")["share"]
-
-        early_s, late_s = norm_share(early), norm_share(late)
-        all_g = sorted(set(early_s.index) | set(late_s.index))
-        deltas: List[Tuple[str, float]] = []
-        for gname in all_g:
-            deltas.append((gname, float(late_s.get(gname, 0.0) - early_s.get(gname, 0.0))))
-        deltas.sort(key=lambda x: x[1], reverse=True)
-
-        rising = [(name, round(delta, 3)) for name, delta in deltas[:3] if delta > 0]
-        falling = [(name, round(delta, 3)) for name, delta in deltas[-3:] if delta < 0]
+    # Genre movement: rising/falling between the end windows, plus change points
+    rising, falling = bundle.trends.movers(k=3)
+    shifts = bundle.trends.change_points(k=3)
+    genre_shifts = [(g, str(m)[:7], float(b), float(a))
+                    for g, m, b, a in zip(shifts["genre"], shifts["month"], shifts["before"], shifts["after"])]
 
     return {
         "total_tracks": total_tracks,
@@ -135,6 +97,7 @@ def compute_evolution_stats(tracks_df: pd.DataFrame, enriched: pd.DataFrame) ->
         "median_age_years": median_age,
         "rising_genres": rising,
         "falling_genres": falling,
+        "genre_shifts": genre_shifts,
     }
 
 
@@ -161,6 +124,10 @@ def build_rule_based_summary(stats, evolution=None, playlist_title: str | None =
         rise = (", rising: " + ", ".join(g for g,_ in evolution.get("rising_genres", [])[:2])) if evolution.get("rising_genres") else ""
         fall = (", cooling: " + ", ".join(g for g,_ in evolution.get("falling_genres", [])[:2])) if evolution.get("falling_genres") else ""
         evo_line = f" Curation pace feels {pace}{(', ' + novelty) if novelty else ''}{rise}{fall}."
+        if evolution.get("genre_shifts"):
+            g, month, before, after = evolution["genre_shifts"][0]
+            turn = "took off" if after > before else "faded"
+            evo_line += f" {g.capitalize()} {turn} around {month} ({before:.0%} → {after:.0%} of adds)."
 
     title_hint = ""
     if playlist_title:
@@ -182,11 +149,11 @@ def pick_openai_model() -> Optional[str]:
     Returns preferred available OpenAI model ID if API key is configured, else None.
     Checks for OPENAI_MODEL override first.
     """
-    override = st.secrets.get("OPENAI_MODEL") or os.getenv("OPENAI_MODEL")
+    override = get_setting("OPENAI_MODEL")
     if override:
         return override
 
-    api_key = st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+    api_key = get_setting("OPENAI_API_KEY")
     if not api_key:
         return None
 
@@ -205,7 +172,7 @@ def pick_openai_model() -> Optional[str]:
 # ---------------------------- LLM summary ---------------------------- #
 
 def llm_vibe_summary_detailed(stats, evolution=None, vibe_hint=None, playlist_title: str | None = None):
-    api_key = st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+    api_key = get_setting("OPENAI_API_KEY")
     if not api_key:
         return None, None
 
@@ -233,6 +200,9 @@ def llm_vibe_summary_detailed(stats, evolution=None, vibe_hint=None, playlist_ti
                 evo_lines.append("- Rising genres: " + ", ".join([f"{g} (+{abs(s):.0%})" for g, s in evolution["rising_genres"]]))
             if evolution.get("falling_genres"):
                 evo_lines.append("- Declining genres: " + ", ".join([f"{g} ({-abs(s):.0%})" for g, s in evolution["falling_genres"]]))
+            if evolution.get("genre_shifts"):
+                evo_lines.append("- Genre turning points: " + "; ".join(
+                    [f"{g} around {m} ({b:.0%} → {a:.0%} of adds)" for g, m, b, a in evolution["genre_shifts"]]))
         evo_block = "\n".join(evo_lines) if evo_lines else "none"
 
         system = (
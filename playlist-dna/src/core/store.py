@@ -0,0 +1,156 @@
+# src/core/store.py
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from src.core.settings import get_setting
+
+APP_DIR = Path(__file__).resolve().parents[2]
+# not ".cache": that is the token file spotipy writes to the working directory
+CACHE_DIR = Path(get_setting("PLAYLIST_DNA_CACHE_DIR", APP_DIR / ".playlist_dna_cache"))
+# Genres/popularity drift slowly; a week-old artist row is still good enough
+ARTIST_TTL = float(get_setting("ARTIST_CACHE_TTL", 7 * 24 * 3600))
+
+_SQL_VARS = 500  # stay well under SQLite's bound-parameter limit
+
+log = logging.getLogger(__name__)
+
+
+class ArtistStore:
+    """On-disk artist metadata keyed by artist_id, each row stamped with its fetch time."""
+
+    def __init__(self, path: Path, ttl: float = ARTIST_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = self.misses = self.stale = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artists ("
+                " artist_id TEXT PRIMARY KEY, artist_name TEXT, genres TEXT,"
+                " artist_popularity INTEGER, fetched_at REAL NOT NULL)"
+            )
+
+    def get_many(self, artist_ids: list[str]) -> tuple[dict, list[str]]:
+        """Returns ({artist_id: row} for fresh rows, [ids that are missing or stale])."""
+        cutoff = time.time() - self.ttl
+        found, stale = {}, set()
+        with self._lock:
+            for i in range(0, len(artist_ids), _SQL_VARS):
+                chunk = artist_ids[i:i + _SQL_VARS]
+                marks = ",".join("?" * len(chunk))
+                cur = self._conn.execute(
+                    f"SELECT artist_id, artist_name, genres, artist_popularity, fetched_at"
+                    f" FROM artists WHERE artist_id IN ({marks})", chunk,
+                )
+                for aid, name, genres, pop, fetched_at in cur:
+                    if fetched_at < cutoff:
+                        stale.add(aid)
+                        continue
+                    found[aid] = {
+                        "artist_id": aid,
+                        "artist_name": name,
+                        "genres": json.loads(genres or "[]"),
+                        "artist_popularity": pop,
+                    }
+            todo = [a for a in artist_ids if a not in found]
+            self.hits += len(found)
+            self.misses += len(todo) - len(stale)
+            self.stale += len(stale)
+        return found, todo
+
+    def put_many(self, rows: list[dict]):
+        now = time.time()
+        params = [
+            (r["artist_id"], r.get("artist_name"), json.dumps(r.get("genres") or []), r.get("artist_popularity"), now)
+            for r in rows if r.get("artist_id")
+        ]
+        if not params:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO artists"
+                " (artist_id, artist_name, genres, artist_popularity, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                params,
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "stale": self.stale, "size": size}
+
+
+_artist_store = None
+_artist_store_lock = threading.Lock()
+
+
+def get_artist_store() -> ArtistStore:
+    """Process-wide artist store (one SQLite connection shared by all sessions)."""
+    global _artist_store
+    with _artist_store_lock:
+        if _artist_store is None:
+            _artist_store = ArtistStore(CACHE_DIR / "artists.sqlite")
+        return _artist_store
+
+
+class SnapshotStore:
+    """Last analyzed snapshot per (playlist_id, market), pickled on disk.
+
+    A record looks like {"snapshot_id": str, "total": int,
+    "pages": {offset: {"fp": tuple, "cols": {column: [values]}, "dropped": int}}},
+    so a changed snapshot can be patched page by page. Records written by an
+    older layout (different VERSION) are ignored and rebuilt; unreadable ones
+    are deleted, and the caller falls back to a full fetch.
+
+    Fingerprints are compared per fixed page offset, so a track inserted or
+    removed mid-playlist shifts every later page and refetches all of them.
+    """
+    VERSION = 2
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, playlist_id: str, market: str) -> Path:
+        return self.root / f"{playlist_id}_{market}.pkl"
+
+    def load(self, playlist_id: str, market: str) -> dict | None:
+        path = self._path(playlist_id, market)
+        try:
+            with open(path, "rb") as f:
+                record = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # truncated file, or classes from an older build
+            log.warning("dropping unreadable snapshot %s: %r", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+        if not isinstance(record, dict) or record.get("version") != self.VERSION:
+            return None
+        return record
+
+    def save(self, playlist_id: str, market: str, record: dict):
+        path = self._path(playlist_id, market)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({**record, "version": self.VERSION}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # atomic swap so concurrent readers never see a partial file
+
+
+_snapshot_store = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _snapshot_store
+    with _snapshot_store_lock:
+        if _snapshot_store is None:
+            _snapshot_store = SnapshotStore(CACHE_DIR / "playlists")
+        return _snapshot_store
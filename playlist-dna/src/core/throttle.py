@@ -0,0 +1,80 @@
+# src/core/throttle.py
+import asyncio
+import threading
+import time
+from collections import deque
+
+DEFAULT_RETRY_AFTER = 1.0   # seconds, when a 429 arrives without a Retry-After header
+MAX_RETRY_AFTER = 120.0     # never trust a larger window than this
+
+
+def retry_after_seconds(headers) -> float:
+    """Retry-After (delta-seconds form) from a headers mapping, case-insensitively."""
+    value = None
+    for k, v in (headers or {}).items():
+        if str(k).lower() == "retry-after":
+            value = v
+            break
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class ThrottleCoordinator:
+    """Process-wide 429 gate.
+
+    A single Retry-After pauses every outbound Spotify call (all sessions,
+    all worker threads, sync and async) until the window passes, instead of
+    each caller retrying on its own schedule.
+    """
+
+    def __init__(self, max_events: int = 200):
+        self._lock = threading.Lock()
+        self._paused_until = 0.0     # time.monotonic() deadline
+        self._lost = 0.0             # union of pause windows, in wall seconds
+        self._count = 0
+        self.events = deque(maxlen=max_events)
+
+    def remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def wait(self) -> float:
+        """Block while a pause is in effect. Returns seconds waited."""
+        waited = 0.0
+        while (delay := self.remaining()) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def wait_async(self) -> float:
+        waited = 0.0
+        while (delay := self.remaining()) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def report(self, retry_after: float, source: str = "") -> float:
+        """Record a 429 and extend the global pause. Returns the pause length."""
+        now = time.monotonic()
+        until = now + retry_after
+        with self._lock:
+            if until > self._paused_until:
+                # only the part not already covered by an earlier pause is new lost time
+                self._lost += until - max(now, self._paused_until)
+                self._paused_until = until
+            self._count += 1
+            self.events.append({"at": time.time(), "retry_after": retry_after, "source": source})
+        return retry_after
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "throttle_events": self._count,
+                "lost_seconds": round(self._lost, 3),
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            }
+
+
+coordinator = ThrottleCoordinator()
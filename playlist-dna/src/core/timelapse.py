@@ -0,0 +1,105 @@
+# src/core/timelapse.py
+"""Evolution timelapse: cumulative genre, decade and lead-artist composition
+over the order tracks were added, as one compact payload for the browser.
+
+Dated tracks are cut, in added_at order, into at most MAX_FRAMES frames of
+equal track counts. A frame stores only what it adds: per dimension a flat
+[category, count, category, count, ...] delta over the previous frame. The
+client keeps running totals, so frame i is frame i-1 plus its delta and the
+whole history plays (or scrubs) without asking the server again. Each
+dimension keeps its TOP_CATEGORIES most common categories by final count.
+
+The payload is JSON, built once per (playlist_id, snapshot_id, market) and
+cached.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.core.bundle import AnalysisBundle
+from src.core.genres import GenreMatrix
+from src.core.model import PlaylistModel
+from src.core.timeline import dates, per_row
+
+MAX_FRAMES = 240
+TOP_CATEGORIES = 40
+
+
+def _deltas(frame_of: np.ndarray, codes: np.ndarray, n_frames: int, n_codes: int) -> list[list[int]]:
+    """Per frame, the flat [code, count, ...] of (frame, code) pairs; code -1 is skipped."""
+    if not n_codes:
+        return [[] for _ in range(n_frames)]
+    keep = codes >= 0
+    flat = np.bincount(frame_of[keep].astype(np.int64) * n_codes + codes[keep], minlength=n_frames * n_codes)
+    frame, code = np.divmod(np.flatnonzero(flat), n_codes)
+    pairs = np.column_stack([code, flat[frame * n_codes + code]]).ravel().tolist()
+    bounds = 2 * np.searchsorted(frame, np.arange(n_frames + 1))
+    return [pairs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _top(names: np.ndarray, counts: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """(kept names, code per original id or -1) for the k largest counts."""
+    order = np.argsort(-counts, kind="stable")[:k]
+    order = order[counts[order] > 0]
+    remap = np.full(len(names), -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return names[order], remap
+
+
+def build_timelapse(model: PlaylistModel, genres: GenreMatrix, bundle: AnalysisBundle,
+                    max_frames: int = MAX_FRAMES, k: int = TOP_CATEGORIES) -> dict | None:
+    """Payload dict, or None when no track has an added_at."""
+    order = bundle.track_facts["added_order"]
+    dated = order.notna().to_numpy()
+    n_dated = int(dated.sum())
+    if not n_dated:
+        return None
+    n_frames = min(max_frames, n_dated)
+    # frame of each dated track: equal slices of the add order
+    position = order.to_numpy(dtype=np.int64, na_value=0) - 1
+    frame_of = np.full(len(order), -1, dtype=np.int64)
+    frame_of[dated] = position[dated] * n_frames // n_dated
+    sizes = np.bincount(frame_of[dated], minlength=n_frames)
+
+    # label: the day the frame's last track was added
+    by_order = np.flatnonzero(dated)[np.argsort(position[dated], kind="stable")]
+    last_rows = by_order[np.cumsum(sizes) - 1]
+    day = per_row(bundle.times, "day", len(order)).to_numpy()
+    labels = [str(d) for d in dates(day[last_rows])]
+
+    dims = {}
+    # genres: one (track, genre) pair per nnz of the matrix
+    g_names, g_code = _top(genres.vocab, genres.counts(dated), k)
+    nnz_rows = np.repeat(np.arange(genres.n_tracks), np.diff(genres.indptr))
+    g_frames = frame_of[nnz_rows]
+    in_time = g_frames >= 0
+    dims["genres"] = (g_names, _deltas(g_frames[in_time], g_code[genres.indices[in_time]], n_frames, len(g_names)))
+
+    decade = bundle.track_facts["decade"].to_numpy(dtype=np.int64, na_value=-1)
+    d_values = np.unique(decade[dated & (decade >= 0)])
+    d_code = np.where(decade >= 0, np.searchsorted(d_values, decade), -1)
+    dims["decades"] = (np.array([f"{d}s" for d in d_values], dtype=object),
+                       _deltas(frame_of[dated], d_code[dated], n_frames, len(d_values)))
+
+    lead = model.lead_artist()
+    a_codes, a_names = pd.factorize(lead.astype(object))
+    a_counts = np.bincount(a_codes[dated & (a_codes >= 0)], minlength=len(a_names))
+    a_names, a_remap = _top(np.asarray(a_names, dtype=object), a_counts, k)
+    a_code = np.where(a_codes >= 0, a_remap[np.maximum(a_codes, 0)], -1)
+    dims["artists"] = (a_names, _deltas(frame_of[dated], a_code[dated], n_frames, len(a_names)))
+
+    return {
+        "labels": labels,
+        "sizes": sizes.tolist(),
+        "dims": {name: {"names": [str(x) for x in names], "deltas": deltas}
+                 for name, (names, deltas) in dims.items()},
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def timelapse_payload(key: tuple, _model: PlaylistModel, _genres: GenreMatrix, _bundle: AnalysisBundle) -> str | None:
+    """JSON payload cached per `key` (playlist_id, snapshot_id, market); the frames are not hashed."""
+    payload = build_timelapse(_model, _genres, _bundle)
+    return None if payload is None else json.dumps(payload, separators=(",", ":"))
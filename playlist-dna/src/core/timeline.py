@@ -0,0 +1,54 @@
+# src/core/timeline.py
+"""Calendar features of `added_at`, derived once per analysis.
+
+One row per dated track (index = the track's row), all int columns, UTC:
+  day      days since 1970-01-01 (epoch day)
+  week     epoch day of the ISO week's Monday
+  month    months since 1970-01
+  weekday  0 = Monday … 6 = Sunday
+  hour     0–23
+Views and stats group on these integer keys and turn only the grouped keys
+back into dates (`dates`, `month_starts`) for display.
+"""
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+COLUMNS = ("day", "week", "month", "weekday", "hour")
+
+
+def time_features(tracks: pd.DataFrame) -> pd.DataFrame:
+    if "added_at" not in tracks:
+        return pd.DataFrame({c: np.array([], dtype=np.int32) for c in COLUMNS})
+    added = tracks["added_at"]
+    if isinstance(added.dtype, pd.DatetimeTZDtype):
+        added = added.dt.tz_convert(None)  # the one conversion, to naive UTC
+    dated = added.notna().to_numpy()
+    stamps = added.to_numpy()[dated]
+    seconds = stamps.astype("datetime64[s]").astype(np.int64)
+    day = seconds // 86400
+    weekday = (day + 3) % 7  # 1970-01-01 was a Thursday
+    return pd.DataFrame({
+        "day": day.astype(np.int32),
+        "week": (day - weekday).astype(np.int32),
+        "month": stamps.astype("datetime64[M]").astype(np.int32),
+        "weekday": weekday.astype(np.int8),
+        "hour": (seconds % 86400 // 3600).astype(np.int8),
+    }, index=tracks.index[dated])
+
+
+def per_row(times: pd.DataFrame, column: str, n: int, missing: int = -1) -> pd.Series:
+    """`column` for every track row, `missing` where the track has no added_at."""
+    out = np.full(n, missing, dtype=np.int64)
+    out[times.index.to_numpy()] = times[column].to_numpy()
+    return pd.Series(out, name=column)
+
+
+def dates(days) -> np.ndarray:
+    """Epoch-day keys → datetime64[D]."""
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]")
+
+
+def month_starts(months) -> np.ndarray:
+    """Month keys → datetime64 of the first day of the month."""
+    return np.asarray(months, dtype=np.int64).astype("datetime64[M]").astype("datetime64[D]")
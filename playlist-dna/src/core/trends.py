@@ -0,0 +1,126 @@
+# src/core/trends.py
+"""Genre trends over time, answered from cumulative counts.
+
+Built once per analysis from the genre matrix and the added_at month keys:
+  cum[g, i]     tracks of genre g added in the first i months
+  cum_tracks[i] dated tracks added in the first i months
+Tracks without genres count as UNKNOWN, so shares match the Evolution chart.
+Any window's counts are then one subtraction per genre. Rolling shares,
+rising/falling rankings and change points are all vectorized over
+genres × months, with no grouping at query time.
+"""
+import numpy as np
+import pandas as pd
+
+from src.core.genres import GenreMatrix
+from src.core.timeline import month_starts, per_row
+
+UNKNOWN = "unknown"
+TREND_WINDOW = 3   # months compared at each end for rising/falling
+MIN_TRACKS = 3     # fewer tracks than this (in the windows compared) is noise
+MIN_SHIFT = 0.05   # smallest share change reported as a change point
+MIN_SIDE = 10      # tracks needed on each side of a change point
+
+
+class GenreTrends:
+    """Cumulative monthly genre counts; months are contiguous, empty ones included."""
+
+    def __init__(self, genres: np.ndarray, months: np.ndarray, cum: np.ndarray, cum_tracks: np.ndarray):
+        self.genres = genres            # names, most tracks first (UNKNOWN included)
+        self.months = months            # month keys (src/core/timeline.py)
+        self.cum = cum                  # (n_genres, n_months + 1)
+        self.cum_tracks = cum_tracks    # (n_months + 1,)
+        self.n_months = len(months)
+        self.totals = cum[:, -1]
+
+    # --- windows ---
+    def counts(self, lo: int = 0, hi: int | None = None) -> np.ndarray:
+        """Tracks per genre added in months [lo, hi) (positions, not keys)."""
+        hi = self.n_months if hi is None else hi
+        return self.cum[:, hi] - self.cum[:, lo]
+
+    def shares(self, lo: int = 0, hi: int | None = None) -> np.ndarray:
+        """Share of the tracks added in months [lo, hi) carrying each genre."""
+        hi = self.n_months if hi is None else hi
+        return self.counts(lo, hi) / max(int(self.cum_tracks[hi] - self.cum_tracks[lo]), 1)
+
+    def rolling(self, window: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """(counts, shares), each (n_genres, n_months), over the `window` months ending at each month."""
+        hi = np.arange(1, self.n_months + 1)
+        lo = np.maximum(hi - max(window, 1), 0)
+        counts = self.cum[:, hi] - self.cum[:, lo]
+        return counts, counts / np.maximum(self.cum_tracks[hi] - self.cum_tracks[lo], 1)
+
+    def frame(self, k: int = 8, window: int = 1) -> pd.DataFrame:
+        """[month, genres, count, share] for the k genres with the most tracks, rolling over `window` months."""
+        top = np.argsort(-self.totals, kind="stable")[:k]
+        top = top[self.totals[top] > 0]
+        counts, shares = self.rolling(window)
+        return pd.DataFrame({
+            "month": np.tile(month_starts(self.months), len(top)),
+            "genres": np.repeat(self.genres[top], self.n_months),
+            "count": counts[top].ravel(),
+            "share": shares[top].ravel(),
+        })
+
+    # --- movement ---
+    def movers(self, k: int = 3, window: int = TREND_WINDOW) -> tuple[list, list]:
+        """(rising, falling) [(genre, share change)] between the first and last `window` months,
+        biggest change first. Windows shrink so they never overlap."""
+        window = min(window, self.n_months // 2)
+        if window < 1:
+            return [], []
+        early, late = self.counts(0, window), self.counts(self.n_months - window)
+        delta = self.shares(self.n_months - window) - self.shares(0, window)
+        ok = (early + late >= MIN_TRACKS) & (self.genres != UNKNOWN)
+        order = np.argsort(-delta, kind="stable")
+        rising = [(str(self.genres[g]), round(float(delta[g]), 3)) for g in order if ok[g] and delta[g] > 0][:k]
+        falling = [(str(self.genres[g]), round(float(delta[g]), 3)) for g in order[::-1] if ok[g] and delta[g] < 0][:k]
+        return rising, falling
+
+    def change_points(self, k: int | None = None, min_shift: float = MIN_SHIFT) -> pd.DataFrame:
+        """[genre, month, before, after]: per genre, the month splitting its history into the two
+        most different shares (difference weighted by √ of the tracks on each side), kept when the
+        share moves by at least `min_shift`; biggest moves first."""
+        cols = {"genre": [], "month": [], "before": [], "after": []}
+        if self.n_months < 2:
+            return pd.DataFrame(cols)
+        g = np.flatnonzero((self.totals >= MIN_TRACKS) & (self.genres != UNKNOWN))
+        n_all = self.cum_tracks[-1]
+        n_before = self.cum_tracks[1:-1]                     # split before month s, s = 1..n_months-1
+        n_after = n_all - n_before
+        before = self.cum[g, 1:-1] / np.maximum(n_before, 1)
+        after = (self.totals[g, None] - self.cum[g, 1:-1]) / np.maximum(n_after, 1)
+        valid = (n_before >= MIN_SIDE) & (n_after >= MIN_SIDE)
+        score = np.abs(after - before) * np.sqrt(n_before * n_after / max(n_all, 1)) * valid
+        best = score.argmax(axis=1)
+        rows = np.arange(len(g))
+        b, a = before[rows, best], after[rows, best]
+        keep = valid[best] & (np.abs(a - b) >= min_shift)
+        order = np.argsort(-np.abs(a - b)[keep], kind="stable")[:k]
+        return pd.DataFrame({
+            "genre": self.genres[g[keep][order]],
+            "month": month_starts(self.months[best[keep][order] + 1]),
+            "before": b[keep][order].round(3),
+            "after": a[keep][order].round(3),
+        })
+
+
+def build_trends(genres: GenreMatrix, times: pd.DataFrame) -> GenreTrends:
+    """Monthly cumulative counts over the dated rows of the genre matrix."""
+    if times.empty:
+        return GenreTrends(np.array([], dtype=object), np.array([], dtype=np.int32),
+                           np.zeros((0, 1), dtype=np.int32), np.zeros(1, dtype=np.int32))
+    first, last = int(times["month"].min()), int(times["month"].max())
+    months = np.arange(first, last + 1, dtype=np.int32)
+    buckets = per_row(times, "month", genres.n_tracks).to_numpy()
+    buckets = np.where(buckets >= 0, buckets - first, -1)
+    per_month, bare = genres.bucket_counts(buckets, len(months))
+    names = np.append(genres.vocab, UNKNOWN)
+    per_month = np.vstack([per_month, bare])
+    order = np.argsort(-per_month.sum(axis=1), kind="stable")  # vocab order breaks ties
+    cum = np.zeros((len(names), len(months) + 1), dtype=np.int32)
+    np.cumsum(per_month[order], axis=1, out=cum[:, 1:])
+    cum_tracks = np.zeros(len(months) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(buckets[buckets >= 0], minlength=len(months)), out=cum_tracks[1:])
+    return GenreTrends(names[order].astype(object), months, cum, cum_tracks)
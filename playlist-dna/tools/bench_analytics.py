@@ -0,0 +1,236 @@
+# tools/bench_analytics.py
+"""Timings for the analysis path, from raw playlist items to rendered views.
+
+    python -m tools.bench_analytics                          # 100 1000 5000 10000 tracks
+    python -m tools.bench_analytics --sizes 1000 --repeat 9 --no-views
+    python -m tools.bench_analytics --out bench.json --compare baseline.json
+
+Playlists come from tools/fixtures.synthetic_playlist (multi-artist credits,
+long-tail genres, bursty added_at) and go through projected pages like the
+real fetch. Stages:
+  decode            JSON decode of the projected pages (orjson when installed)
+  build_columns     per-page column building, as in load_playlist
+  tracks_frame      columns → typed tracks frame (dedupe, added_at parsing)
+  artists_frame     artist objects → artist frame
+  build_model       tracks/artists/credits model
+  genre_matrix      track × genre incidence matrix
+  bundle            precomputed aggregates shared by the views (genre trends included)
+  search_index      token/trigram index behind the Search view
+  search_keystrokes one query per keystroke of typing a track name (plus typos)
+  timelapse         incremental frames behind the Timelapse view (uncached build)
+  compute_stats, compute_evolution_stats
+  view:<name>       a rerun of render_<name> on a warm AppTest with the frames
+                    in session state (script overhead included; see view:noop)
+  fragment:<name>   the view's widget fragment alone: what a slider move,
+                    filter change or keystroke re-executes (AppTest itself
+                    always reruns the whole script, so it is timed directly)
+
+Each stage reports min and median wall time over --repeat runs. Output is
+one JSON document; --compare flags stages slower than --threshold × the
+baseline's median.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import pandas as pd
+from streamlit.logger import set_log_level
+
+from src.core.bundle import build_bundle
+from src.core.genres import build_genre_matrix
+from src.core.model import build_model
+from src.core.search import build_search_index
+from src.core.timelapse import build_timelapse
+from src.core.rows import (TRACK_PAGE_FIELDS, build_columns, concat_columns, take_unseen, tracks_frame,
+                           artist_row, json_loads)
+from src.core.stats import compute_stats, compute_evolution_stats
+from tools.fields import apply_fields
+from tools.fixtures import synthetic_playlist, paginate
+
+VIEWS = ["overview", "evolution", "timelapse", "genres", "artists", "time", "popularity",
+         "covers", "search", "companion", "export"]
+PALETTE = ["#1b5e20", "#2e7d32", "#388e3c", "#43a047", "#4caf50",
+           "#66bb6a", "#81c784", "#a5d6a7", "#c8e6c9"]
+# view -> (fragment, its arguments from the session state), as the view passes them
+FRAGMENTS = {
+    "evolution": ("_genre_trends", lambda ss: (ss["bundle"].trends, PALETTE)),
+    "genres": ("_genre_bars", lambda ss: (ss["bundle"], ss["genre_matrix"], "genres_tab_filter", "#43a047")),
+    "artists": ("_top_artists", lambda ss: (ss["bundle"], "#43a047")),
+    "time": ("_artist_year_heatmap", lambda ss: (ss["bundle"], PALETTE)),
+    "popularity": ("_histogram", lambda ss: (ss["bundle"].popularity_counts, "#43a047")),
+    "covers": ("_cover_grid", lambda ss: (ss["tracks_df"].dropna(subset=["image"]),)),
+    "search": ("_search", lambda ss: (ss["tracks_df"], ss["search_index"], ss["genre_matrix"], ss["bundle"],
+                                      "#43a047")),
+    "export": ("_downloads", lambda ss: (ss["tracks_df"], ss["model"].artists, ss["bundle"].track_facts)),
+}
+
+
+def _time(fn, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        gc.collect()  # keep collections of the previous run out of this one
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {"min_ms": round(min(runs), 3), "median_ms": round(statistics.median(runs), 3)}
+
+
+def _pages(pl: dict) -> list:
+    pid = pl["meta"]["id"]
+    return [apply_fields(paginate(pid, pl["items"], off), TRACK_PAGE_FIELDS)
+            for off in range(0, len(pl["items"]), 100)]
+
+
+def _columns(pages: list) -> list[dict]:
+    return [build_columns(page.get("items", []))[0] for page in pages]
+
+
+def _frame(batches: list[dict]) -> pd.DataFrame:
+    return tracks_frame(take_unseen(concat_columns(batches), set()))
+
+
+def _view_script(name: str) -> str:
+    if name == "noop":
+        return "import streamlit as st\n"
+    args = "" if name == "export" else f"{PALETTE!r}, '#43a047', '#2e7d32', '#66bb6a'"
+    return f"from views.{name} import render_{name}\nrender_{name}({args})\n"
+
+
+def _fragment_script(name: str) -> str:
+    fn = FRAGMENTS[name][0]
+    return f"import streamlit as st\nfrom views.{name} import {fn}\n{fn}(*st.session_state['fragment_args'])\n"
+
+
+def _session_state(model, genres, bundle, index) -> dict:
+    """What app.py leaves in session state after an analysis."""
+    tracks_df = model.tracks
+    return {
+        "tracks_df": tracks_df,
+        "model": model,
+        "genre_matrix": genres,
+        "bundle": bundle,
+        "search_index": index,
+        "meta": {"name": "bench", "owner": "bench", "dropped": 0},
+        "preview_idx": tracks_df.index.tolist(),
+        "covers_idx": tracks_df.dropna(subset=["image"]).index.tolist(),
+        "genres_tab_filter": [],
+    }
+
+
+def _time_script(script: str, state: dict, repeat: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(script, default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+
+    def run():
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"script raised: {at.exception[0].message}\n{script}")
+
+    run()  # first run pays for imports and AppTest setup
+    return _time(run, repeat)
+
+
+def bench_size(n: int, repeat: int, views: bool) -> list[dict]:
+    pl = synthetic_playlist(n, seed=n)
+    pages = _pages(pl)
+    blobs = [json.dumps(p).encode("utf-8") for p in pages]
+    batches = _columns(pages)
+    tracks_df = _frame(batches)
+    artists = list(pl["artists"].values())
+    artists_df = pd.DataFrame([artist_row(a) for a in artists])
+    model = build_model(tracks_df, artists_df)
+    genres = build_genre_matrix(model)
+    bundle = build_bundle(("bench", n, "US"), model, genres)
+    index = build_search_index(model.tracks)
+    typed = f"{tracks_df['name'].iloc[n // 2]} {tracks_df['artist'].iloc[n // 2]}"
+    keystrokes = [typed[:i] for i in range(1, len(typed) + 1)] + ["tarck", "atrist 0001"]
+
+    stages = {
+        "decode": lambda: [json_loads(b) for b in blobs],
+        "build_columns": lambda: _columns(pages),
+        "tracks_frame": lambda: _frame(batches),
+        "artists_frame": lambda: pd.DataFrame([artist_row(a) for a in artists]),
+        "build_model": lambda: build_model(tracks_df, artists_df),
+        "genre_matrix": lambda: build_genre_matrix(model),
+        "bundle": lambda: build_bundle(("bench", n, "US"), model, genres),
+        "search_index": lambda: build_search_index(model.tracks),
+        "search_keystrokes": lambda: [index.search(q) for q in keystrokes],
+        "timelapse": lambda: build_timelapse(model, genres, bundle),
+        "compute_stats": lambda: compute_stats(bundle),
+        "compute_evolution_stats": lambda: compute_evolution_stats(model.tracks, bundle),
+    }
+    shape = {"size": n, "tracks": len(tracks_df), "credits": len(model.credits)}
+    results = [{**shape, "stage": stage, **_time(fn, repeat)} for stage, fn in stages.items()]
+    if views:
+        state = _session_state(model, genres, bundle, index)
+        for name in ["noop"] + VIEWS:
+            results.append({**shape, "stage": f"view:{name}", **_time_script(_view_script(name), state, repeat)})
+        for name, (_, args) in FRAGMENTS.items():
+            results.append({**shape, "stage": f"fragment:{name}",
+                            **_time_script(_fragment_script(name), {**state, "fragment_args": args(state)}, repeat)})
+    return results
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[dict]:
+    base = {(r["size"], r["stage"]): r["median_ms"] for r in baseline.get("results", [])}
+    out = []
+    for r in results:
+        before = base.get((r["size"], r["stage"]))
+        if before:
+            ratio = r["median_ms"] / before
+            out.append({"size": r["size"], "stage": r["stage"], "baseline_ms": before,
+                        "median_ms": r["median_ms"], "ratio": round(ratio, 3),
+                        "regression": ratio > threshold})
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--no-views", action="store_true", help="skip the AppTest view timings")
+    ap.add_argument("--out", help="also write the JSON document to this file")
+    ap.add_argument("--compare", metavar="BASELINE_JSON", help="an earlier --out file")
+    ap.add_argument("--threshold", type=float, default=1.2, help="regression ratio for --compare")
+    args = ap.parse_args()
+    set_log_level("error")  # bare-mode ScriptRunContext warnings
+
+    results = []
+    for n in args.sizes:
+        results.extend(bench_size(n, args.repeat, views=not args.no_views))
+
+    doc = {
+        "benchmark": "analytics",
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            doc["comparison"] = compare(results, json.load(f), args.threshold)
+    text = json.dumps(doc, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
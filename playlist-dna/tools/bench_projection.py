@@ -0,0 +1,130 @@
+# tools/bench_projection.py
+"""Bytes and JSON parse time for full vs. `fields`-projected playlist payloads.
+
+    python -m tools.bench_projection                       # recorded fixtures, else synthetic
+    python -m tools.bench_projection --synthetic 5000
+    python -m tools.bench_projection --record <playlist_id> [--market US]
+
+Recorded fixtures live in tools/fixtures/<playlist_id>.full.json and
+<playlist_id>.projected.json ({"meta": ..., "pages": [...]}; the full file
+also keeps {"artists": {id: artist}} for tools/standin.py). When only the
+full file exists, the projection is applied locally (tools/fields.py).
+Results are printed as one JSON document. Byte counts are compact
+re-encodings of the payloads, not raw wire bytes.
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from src.core.rows import META_FIELDS, TRACK_PAGE_FIELDS, build_columns
+from tools.fields import apply_fields
+from tools.fixtures import synthetic_playlist, paginate
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def _encode(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _parse_ms(blobs: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for b in blobs:
+            json.loads(b)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def compare(name: str, full: dict, projected: dict | None, repeat: int) -> dict:
+    if projected is None:
+        projected = {
+            "meta": apply_fields(full["meta"], META_FIELDS),
+            "pages": [apply_fields(p, TRACK_PAGE_FIELDS) for p in full["pages"]],
+        }
+    full_blobs = [_encode(full["meta"])] + [_encode(p) for p in full["pages"]]
+    proj_blobs = [_encode(projected["meta"])] + [_encode(p) for p in projected["pages"]]
+
+    # The projection must not change what the row builder produces
+    full_rows = build_columns([it for p in full["pages"] for it in p.get("items", [])])
+    proj_rows = build_columns([it for p in projected["pages"] for it in p.get("items", [])])
+
+    bytes_full, bytes_proj = sum(map(len, full_blobs)), sum(map(len, proj_blobs))
+    ms_full, ms_proj = _parse_ms(full_blobs, repeat), _parse_ms(proj_blobs, repeat)
+    return {
+        "fixture": name,
+        "pages": len(full["pages"]),
+        "bytes_full": bytes_full,
+        "bytes_projected": bytes_proj,
+        "bytes_ratio": round(bytes_proj / bytes_full, 4) if bytes_full else None,
+        "parse_ms_full": round(ms_full, 3),
+        "parse_ms_projected": round(ms_proj, 3),
+        "parse_speedup": round(ms_full / ms_proj, 2) if ms_proj else None,
+        "rows_identical": full_rows == proj_rows,
+    }
+
+
+def _synthetic(n: int) -> dict:
+    pl = synthetic_playlist(n)
+    pid = pl["meta"]["id"]
+    pages = [paginate(pid, pl["items"], off) for off in range(0, len(pl["items"]), 100)]
+    return {"meta": pl["meta"], "pages": pages}
+
+
+def record(playlist_id: str, market: str):
+    """Save the real full and projected payloads for one playlist as fixtures."""
+    import spotipy
+    from spotipy.oauth2 import SpotifyClientCredentials
+
+    sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
+        client_id=os.getenv("SPOTIFY_CLIENT_ID"), client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
+    ))
+    FIXTURE_DIR.mkdir(exist_ok=True)
+    for kind, meta_fields, page_fields in (("full", None, None), ("projected", META_FIELDS, TRACK_PAGE_FIELDS)):
+        meta = sp.playlist(playlist_id, fields=meta_fields, market=market)
+        total = int(meta["tracks"]["total"])
+        pages = [sp.playlist_tracks(playlist_id, fields=page_fields, market=market, limit=100, offset=off)
+                 for off in range(0, total, 100)]
+        payload = {"meta": meta, "pages": pages}
+        if kind == "full":
+            ids = list(dict.fromkeys(a["id"] for p in pages for it in p.get("items", [])
+                                     for a in ((it.get("track") or {}).get("artists") or []) if a.get("id")))
+            payload["artists"] = {a["id"]: a for i in range(0, len(ids), 50)
+                                  for a in sp.artists(ids[i:i + 50])["artists"] if a}
+        out = FIXTURE_DIR / f"{playlist_id}.{kind}.json"
+        out.write_text(json.dumps(payload))
+        print(f"wrote {out} ({len(pages)} pages)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--synthetic", type=int, nargs="*", help="synthetic playlist sizes (default 100 1000 5000)")
+    ap.add_argument("--record", metavar="PLAYLIST_ID")
+    ap.add_argument("--market", default="US")
+    ap.add_argument("--repeat", type=int, default=10, help="parse timing repetitions (best of)")
+    args = ap.parse_args()
+
+    if args.record:
+        record(args.record, args.market)
+        return
+
+    results = []
+    recorded = sorted(FIXTURE_DIR.glob("*.full.json")) if args.synthetic is None else []
+    for path in recorded:
+        pid = path.name[: -len(".full.json")]
+        proj_path = FIXTURE_DIR / f"{pid}.projected.json"
+        full = json.loads(path.read_text())
+        projected = json.loads(proj_path.read_text()) if proj_path.exists() else None
+        results.append(compare(pid, full, projected, args.repeat))
+    if not recorded:
+        for n in args.synthetic or [100, 1000, 5000]:
+            results.append(compare(f"synthetic-{n}", _synthetic(n), None, args.repeat))
+
+    print(json.dumps({"benchmark": "projection", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# tools/fields.py
+"""Local implementation of the Web API `fields` filter (parenthesised form only)."""
+
+
+def parse_fields(spec: str) -> dict:
+    """'a,b(c,d)' -> {'a': None, 'b': {'c': None, 'd': None}}; None means 'keep whole value'."""
+    tree, stack, name = {}, [], ""
+    node = tree
+    for ch in spec.replace(" ", ""):
+        if ch == ",":
+            if name:
+                node.setdefault(name, None)
+            name = ""
+        elif ch == "(":
+            child = node.get(name) or {}
+            node[name] = child
+            stack.append(node)
+            node, name = child, ""
+        elif ch == ")":
+            if name:
+                node.setdefault(name, None)
+            node, name = stack.pop(), ""
+        else:
+            name += ch
+    if name:
+        node.setdefault(name, None)
+    return tree
+
+
+def project(obj, tree):
+    """Apply a parsed fields tree; lists are projected element-wise like the API does."""
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [project(x, tree) for x in obj]
+    if isinstance(obj, dict):
+        return {k: project(obj[k], sub) for k, sub in tree.items() if k in obj}
+    return obj
+
+
+def apply_fields(obj, spec: str | None):
+    return obj if not spec else project(obj, parse_fields(spec))
@@ -0,0 +1,185 @@
+# tools/fixtures.py
+"""Synthetic Spotify payloads shaped like the real Web API responses.
+
+`synthetic_playlist(n)` returns full (unprojected) objects so byte counts and
+parse costs are realistic:
+  - multi-artist credits (mostly 1, sometimes 2–4) with a Zipf-ish lead-artist skew
+  - long-tail genre lists (a few huge genres, hundreds of rare ones, some artists with none)
+  - skewed `added_at`: a handful of burst days on top of an exponential drift
+  - a small share of local files / removed tracks that the row builder must drop
+"""
+import random
+import string
+from datetime import datetime, timedelta, timezone
+
+API = "https://api.spotify.com/v1"
+OPEN = "https://open.spotify.com"
+MARKETS = [a + b for a in string.ascii_uppercase for b in string.ascii_uppercase][:185]
+_B62 = string.ascii_letters + string.digits
+
+_GENRE_BASES = ["pop", "rock", "hip hop", "rap", "r&b", "indie", "house", "techno", "jazz", "soul",
+                "folk", "metal", "punk", "trap", "edm", "country", "latin", "k-pop", "ambient", "funk"]
+_GENRE_PREFIXES = ["", "dance ", "uk ", "atl ", "modern ", "alt ", "dark ", "chill ", "indie ", "deep ",
+                   "melodic ", "art ", "bedroom ", "nu ", "west coast ", "french ", "lo-fi ", "post-", "neo ", "tropical "]
+GENRES = [p + b for b in _GENRE_BASES for p in _GENRE_PREFIXES]
+
+
+def spotify_id(rng: random.Random) -> str:
+    return "".join(rng.choice(_B62) for _ in range(22))
+
+
+def _zipf_pick(rng: random.Random, pool: list, s: float = 1.1, head: float = 0.5):
+    # `head` of the picks follow a Pareto-distributed rank (a few very common
+    # entries); the rest are uniform over the pool, which makes the long tail
+    if rng.random() >= head:
+        return rng.choice(pool)
+    return pool[min(len(pool) - 1, int(rng.paretovariate(s)) - 1)]
+
+
+def _images(rng: random.Random, kind: str) -> list:
+    key = spotify_id(rng).lower()
+    return [{"url": f"https://i.scdn.co/image/{kind}{size}{key}", "height": size, "width": size}
+            for size in (640, 300, 64)]
+
+
+def _artist_full(rng: random.Random, aid: str, name: str) -> dict:
+    n_genres = 0 if rng.random() < 0.1 else rng.randint(1, 6)
+    genres = list(dict.fromkeys(_zipf_pick(rng, GENRES, 0.8) for _ in range(n_genres)))
+    return {
+        "external_urls": {"spotify": f"{OPEN}/artist/{aid}"},
+        "followers": {"href": None, "total": int(rng.paretovariate(0.6) * 1000)},
+        "genres": genres,
+        "href": f"{API}/artists/{aid}",
+        "id": aid,
+        "images": _images(rng, "ab6761610000"),
+        "name": name,
+        "popularity": max(0, min(100, int(rng.gauss(50, 18)))),
+        "type": "artist",
+        "uri": f"spotify:artist:{aid}",
+    }
+
+
+def _artist_simple(a: dict) -> dict:
+    return {k: a[k] for k in ("external_urls", "href", "id", "name", "type", "uri")}
+
+
+def _added_at(rng: random.Random, n: int, start: datetime) -> list[str]:
+    bursts = [start + timedelta(days=rng.uniform(0, 900)) for _ in range(max(1, n // 800))]
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.35:
+            t = rng.choice(bursts) + timedelta(hours=rng.uniform(0, 6))
+        else:
+            t = start + timedelta(days=min(1095.0, rng.expovariate(1 / 240)), hours=rng.uniform(0, 24))
+        out.append(t)
+    return [t.strftime("%Y-%m-%dT%H:%M:%SZ") for t in sorted(out)]
+
+
+def synthetic_playlist(n_tracks: int, seed: int = 7, playlist_id: str | None = None) -> dict:
+    """Returns {"meta": playlist object, "items": [playlist items], "artists": {id: artist object}}."""
+    rng = random.Random(seed)
+    playlist_id = playlist_id or spotify_id(rng)
+
+    n_artists = max(5, n_tracks // 3)
+    artists = {}
+    for i in range(n_artists):
+        aid = spotify_id(rng)
+        artists[aid] = _artist_full(rng, aid, f"Artist {i:05d}")
+    artist_ids = list(artists)
+
+    albums = []
+    user = {"external_urls": {"spotify": f"{OPEN}/user/curator"}, "href": f"{API}/users/curator",
+            "id": "curator", "type": "user", "uri": "spotify:user:curator", "display_name": "Curator"}
+    added = _added_at(rng, n_tracks, datetime(2021, 1, 1, tzinfo=timezone.utc))
+
+    items = []
+    for i in range(n_tracks):
+        n_credits = rng.choices([1, 2, 3, 4], weights=[70, 20, 7, 3])[0]
+        credits = list(dict.fromkeys(_zipf_pick(rng, artist_ids, 0.9) for _ in range(n_credits)))
+        simple = [_artist_simple(artists[a]) for a in credits]
+
+        if albums and rng.random() < 0.3:
+            album = rng.choice(albums)
+        else:
+            alid = spotify_id(rng)
+            year = max(1955, 2024 - int(rng.expovariate(1 / 8)))
+            album = {
+                "album_type": rng.choice(["album", "single", "compilation"]),
+                "total_tracks": rng.randint(1, 18),
+                "available_markets": MARKETS,
+                "external_urls": {"spotify": f"{OPEN}/album/{alid}"},
+                "href": f"{API}/albums/{alid}",
+                "id": alid,
+                "images": _images(rng, "ab67616d0000"),
+                "name": f"Album {len(albums):05d}",
+                "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "release_date_precision": "day",
+                "type": "album",
+                "uri": f"spotify:album:{alid}",
+                "artists": simple[:1],
+            }
+            albums.append(album)
+
+        tid = spotify_id(rng)
+        is_local = rng.random() < 0.01
+        track = {
+            "album": album,
+            "artists": simple,
+            "available_markets": MARKETS,
+            "disc_number": 1,
+            "duration_ms": rng.randint(90_000, 420_000),
+            "explicit": rng.random() < 0.2,
+            "external_ids": {"isrc": "US" + "".join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(10))},
+            "external_urls": {"spotify": f"{OPEN}/track/{tid}"},
+            "href": f"{API}/tracks/{tid}",
+            "id": None if is_local else tid,
+            "is_local": is_local,
+            "name": f"Track {i:05d}",
+            "popularity": max(0, min(100, int(rng.gauss(48, 20)))),
+            "preview_url": None,
+            "track_number": rng.randint(1, 14),
+            "type": "track",
+            "uri": f"spotify:track:{tid}",
+        }
+        items.append({
+            "added_at": added[i],
+            "added_by": {k: v for k, v in user.items() if k != "display_name"},
+            "is_local": is_local,
+            "primary_color": None,
+            "track": None if rng.random() < 0.005 else track,
+            "video_thumbnail": {"url": None},
+        })
+
+    meta = {
+        "collaborative": False,
+        "description": "Synthetic playlist",
+        "external_urls": {"spotify": f"{OPEN}/playlist/{playlist_id}"},
+        "followers": {"href": None, "total": 1234},
+        "href": f"{API}/playlists/{playlist_id}",
+        "id": playlist_id,
+        "images": _images(rng, "ab67706c0000"),
+        "name": f"Synthetic {n_tracks}",
+        "owner": user,
+        "primary_color": None,
+        "public": True,
+        "snapshot_id": f"snap-{seed}-{n_tracks}",
+        "tracks": {"href": f"{API}/playlists/{playlist_id}/tracks", "total": n_tracks},
+        "type": "playlist",
+        "uri": f"spotify:playlist:{playlist_id}",
+    }
+    return {"meta": meta, "items": items, "artists": artists}
+
+
+def paginate(playlist_id: str, items: list, offset: int = 0, limit: int = 100, api: str = API) -> dict:
+    """A /playlists/{id}/tracks page over `items` (full objects, like the real endpoint)."""
+    base = f"{api}/playlists/{playlist_id}/tracks"
+    end = offset + limit
+    return {
+        "href": f"{base}?offset={offset}&limit={limit}",
+        "items": items[offset:end],
+        "limit": limit,
+        "next": f"{base}?offset={end}&limit={limit}" if end < len(items) else None,
+        "offset": offset,
+        "previous": f"{base}?offset={max(0, offset - limit)}&limit={limit}" if offset else None,
+        "total": len(items),
+    }
@@ -0,0 +1,192 @@
+# tools/loadtest.py
+"""Concurrent headless sessions through app.py against a local API stand-in.
+
+    python -m tools.loadtest [--sessions 8] [--actions 20] [--size 2000] [--playlists 2]
+                             [--latency-ms 60 --jitter-ms 30] [--rate-429 0.01]
+
+Starts tools.standin in-process, points the app at it (SPOTIFY_API_BASE /
+SPOTIFY_TOKEN_URL, fresh PLAYLIST_DNA_CACHE_DIR unless --cache-dir), then
+runs --sessions AppTest sessions of app.py on their own threads. Each session
+pastes a playlist on the cover, clicks Analyze, then performs --actions
+random interactions: switch view (the radio keyed "view"), move a slider,
+type a search, plain rerun. Sliders and the search box only exist on the
+views that have them, so those actions land on whatever view is open.
+
+Sessions share one process, so st.cache_data, the artist store, the shared
+client and the single-flight dedupe behave as they do in production.
+Prints one JSON document: per-action rerun latency percentiles, peak RSS,
+the artist store's hit/miss/stale counters and the stand-in's upstream
+request counts.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from streamlit import config
+from streamlit.logger import set_log_level
+from streamlit.proto.Slider_pb2 import Slider as SliderProto
+
+from tools.fixtures import synthetic_playlist
+from tools.standin import StandIn
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+SEARCH_TERMS = ["Track 0", "Artist 00", "Track 01", "Art", "zzz", "Track 00042"]
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"n": 0}
+    qs = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else [values[0]] * 99
+    return {
+        "n": len(values),
+        "p50_ms": round(qs[49], 1),
+        "p90_ms": round(qs[89], 1),
+        "p99_ms": round(qs[98], 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+def _peak_rss_mb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KiB on Linux
+
+
+class Session:
+    """One browser tab: an AppTest plus the latencies of its reruns."""
+
+    def __init__(self, playlist_id: str, actions: int, think_ms: float, seed: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(str(APP), default_timeout=timeout)
+        self.playlist_id, self.actions, self.think_ms = playlist_id, actions, think_ms
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = []
+
+    def _timed(self, action: str, step):
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as e:  # a failed rerun is a result, not a crash of the harness
+            self.errors.append(f"{action}: {type(e).__name__}: {e}")
+            return
+        self.latencies[action].append((time.perf_counter() - t0) * 1000)
+        if self.at.exception:
+            self.errors.append(f"{action}: {self.at.exception[0].message}")
+
+    def _switch_view(self):
+        views = [r for r in self.at.radio if r.key == "view"]
+        if views:
+            views[0].set_value(self.rng.choice(views[0].options))
+        self.at.run()
+
+    def _slider(self):
+        if not self.at.slider:
+            return self.at.run()
+        s = self.rng.choice(list(self.at.slider))
+        if s.proto.data_type == SliderProto.INT:
+            # AppTest hands back the bounds as floats, even for int sliders
+            value = self.rng.randrange(int(s.min), int(s.max) + 1, int(s.step or 1))
+        else:
+            value = self.rng.uniform(s.min, s.max)
+        s.set_value(value).run()
+
+    def _search(self):
+        boxes = [t for t in self.at.text_input if t.key == "search_q"]
+        if not boxes:
+            return self.at.run()
+        boxes[0].input(self.rng.choice(SEARCH_TERMS)).run()
+
+    def run(self):
+        self._timed("cover", self.at.run)
+        self.at.text_input(key="playlist_url").input(self.playlist_id)
+        self._timed("analyze", self.at.button(key="controls_analyze").click().run)
+        if "tracks_df" not in self.at.session_state:
+            self.errors.append("analyze: no tracks in session state")
+            return
+        steps = {"switch_view": self._switch_view, "slider": self._slider,
+                 "search": self._search, "rerun": self.at.run}
+        for _ in range(self.actions):
+            time.sleep(self.rng.uniform(0, self.think_ms) / 1000)
+            action = self.rng.choice(list(steps))
+            self._timed(action, steps[action])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sessions", type=int, default=8)
+    ap.add_argument("--actions", type=int, default=20, help="interactions per session after analyze")
+    ap.add_argument("--think-ms", type=float, default=200, help="max random pause between actions")
+    ap.add_argument("--size", type=int, default=2000, help="tracks per playlist")
+    ap.add_argument("--playlists", type=int, default=1, help="distinct playlists, assigned round-robin")
+    ap.add_argument("--latency-ms", type=float, default=50)
+    ap.add_argument("--jitter-ms", type=float, default=25)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-5xx", type=float, default=0.0)
+    ap.add_argument("--compact", action="store_true", help="enable the compact frame schema")
+    ap.add_argument("--cache-dir", help="reuse a snapshot/artist cache dir (default: fresh temp dir)")
+    ap.add_argument("--timeout", type=float, default=300, help="per-rerun AppTest timeout (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    set_log_level("error")
+    # AppTest turns this on by patching config.get_option for the length of a run; with
+    # sessions on several threads one run's unpatch can land in the middle of another's
+    config.set_option("global.appTest", True)
+
+    standin = StandIn(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                      retry_after=0.5, rate_5xx=args.rate_5xx, seed=args.seed)
+    pids = [standin.add_playlist(synthetic_playlist(args.size, seed=i, playlist_id=f"loadtest{i:014d}"))
+            for i in range(args.playlists)]
+    standin.start()
+    # module-level settings are read on first import, so these must be set before app.py runs
+    os.environ.update(standin.settings)
+    os.environ["PLAYLIST_DNA_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="playlist-dna-load-")
+    if args.compact:
+        os.environ["PLAYLIST_DNA_COMPACT"] = "1"
+
+    sessions = [Session(pids[i % len(pids)], args.actions, args.think_ms, args.seed + i, args.timeout)
+                for i in range(args.sessions)]
+    threads = [threading.Thread(target=s.run, name=f"session-{i}") for i, s in enumerate(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    standin.stop()
+    from src.core.store import get_artist_store  # after the env above: the store reads its dir on import
+
+    by_action = defaultdict(list)
+    for s in sessions:
+        for action, values in s.latencies.items():
+            by_action[action].extend(values)
+    all_reruns = [v for action, values in by_action.items() if action not in ("cover", "analyze") for v in values]
+    errors = [e for s in sessions for e in s.errors]
+
+    print(json.dumps({
+        "benchmark": "loadtest",
+        "sessions": args.sessions,
+        "playlists": args.playlists,
+        "tracks_per_playlist": args.size,
+        "compact": args.compact,
+        "elapsed_seconds": round(elapsed, 2),
+        "latency": {action: _percentiles(v) for action, v in sorted(by_action.items())},
+        "interactive_reruns": _percentiles(all_reruns),
+        "peak_rss_mb": _peak_rss_mb(),
+        "artist_store": get_artist_store().stats(),
+        "upstream": standin.stats()["requests"],
+        "upstream_status": standin.stats()["status"],
+        "errors": len(errors),
+        "error_samples": errors[:5],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
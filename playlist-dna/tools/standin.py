@@ -0,0 +1,336 @@
+# tools/standin.py
+"""Local stand-in for the parts of the Spotify Web API the app uses.
+
+    python -m tools.standin [--port 8765] [--synthetic 100 1000 5000] [--any-id 1000]
+                            [--latency-ms 80 --jitter-ms 40] [--rate-429 0.02 --retry-after 1]
+                            [--rate-5xx 0.01] [--pad-bytes 0] [--token-ttl 3600]
+
+Then run the app (or any tool) with
+
+    SPOTIFY_API_BASE=http://127.0.0.1:8765/v1/
+    SPOTIFY_TOKEN_URL=http://127.0.0.1:8765/api/token
+    SPOTIFY_CLIENT_ID=standin SPOTIFY_CLIENT_SECRET=standin
+
+Endpoints: POST /api/token, GET /v1/playlists/{id}, /v1/playlists/{id}/tracks
+(and /items), /v1/artists?ids=. `fields` is applied like the real API.
+Playlists come from recorded fixtures (tools/fixtures/<id>.full.json, see
+bench_projection --record) and synthetic sizes; synthetic ids are
+`standin` + the zero-padded size, e.g. standin000000000001000.
+
+Control endpoints: GET /__stats, POST /__reset (clears counters),
+POST /__append/<id>?n=25 (adds tracks and bumps snapshot_id).
+
+Faults are drawn from a seeded RNG so runs are reproducible. `--pad-bytes`
+adds a filler string to every API response after projection, to simulate
+heavier payloads on the wire.
+"""
+import argparse
+import json
+import random
+import re
+import secrets
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from tools.fields import apply_fields
+from tools.fixtures import synthetic_playlist, paginate, spotify_id
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+PAGE_MAX = 100
+ARTISTS_MAX = 50
+
+_PLAYLIST_RE = re.compile(r"^/v1/playlists/([^/]+)(/tracks|/items)?$")
+_APPEND_RE = re.compile(r"^/__append/([^/]+)$")
+
+
+def synthetic_id(n_tracks: int) -> str:
+    return f"standin{n_tracks:015d}"
+
+
+def load_fixture(path: Path) -> dict:
+    """A recorded <id>.full.json as {"meta", "items", "artists"}.
+
+    Older recordings have no "artists"; those get minimal artist objects
+    (no genres) built from the track credits.
+    """
+    raw = json.loads(path.read_text())
+    items = [it for page in raw["pages"] for it in page.get("items", [])]
+    artists = raw.get("artists") or {}
+    for it in items:
+        for a in ((it.get("track") or {}).get("artists") or []):
+            if a.get("id") and a["id"] not in artists:
+                artists[a["id"]] = {**a, "genres": [], "popularity": 0}
+    return {"meta": raw["meta"], "items": items, "artists": artists}
+
+
+class StandIn:
+    """The server plus its fixtures, counters and fault settings.
+
+    Usable from code (benchmarks, load tests) as well as from the CLI:
+
+        standin = StandIn(latency_ms=50)
+        standin.add_playlist(synthetic_playlist(1000, playlist_id=synthetic_id(1000)))
+        base = standin.start()          # http://127.0.0.1:<port>
+        ...
+        standin.stop()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, rate_429: float = 0.0, retry_after: float = 1.0,
+                 rate_5xx: float = 0.0, pad_bytes: int = 0, token_ttl: int = 3600,
+                 any_id: int = 0, seed: int = 0):
+        self.host, self.port = host, port
+        self.latency_ms, self.jitter_ms = latency_ms, jitter_ms
+        self.rate_429, self.retry_after, self.rate_5xx = rate_429, retry_after, rate_5xx
+        self.pad_bytes, self.token_ttl, self.any_id = pad_bytes, token_ttl, any_id
+        self.playlists: dict[str, dict] = {}
+        self.artists: dict[str, dict] = {}
+        self._tokens: dict[str, float] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self.reset()
+
+    # --- fixtures ---
+    def add_playlist(self, pl: dict) -> str:
+        pid = pl["meta"]["id"]
+        with self._lock:
+            self.playlists[pid] = {"meta": dict(pl["meta"]), "items": list(pl["items"])}
+            self.artists.update(pl["artists"])
+        return pid
+
+    def load_fixtures(self, fixture_dir: Path = FIXTURE_DIR) -> list[str]:
+        return [self.add_playlist(load_fixture(p)) for p in sorted(fixture_dir.glob("*.full.json"))]
+
+    def add_synthetic(self, n_tracks: int) -> str:
+        return self.add_playlist(synthetic_playlist(n_tracks, seed=n_tracks, playlist_id=synthetic_id(n_tracks)))
+
+    def append_tracks(self, pid: str, n: int) -> dict:
+        """Add `n` new tracks (copies of existing ones with fresh ids) and bump snapshot_id."""
+        pl = self._playlist(pid)
+        if pl is None:
+            return None
+        with self._lock:
+            now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            for _ in range(n):
+                src = self._rng.choice(pl["items"])
+                track = dict(src.get("track") or {})
+                track["id"] = spotify_id(self._rng)
+                track["is_local"] = False
+                pl["items"].append({**src, "added_at": now, "track": track})
+            total = len(pl["items"])
+            pl["meta"]["snapshot_id"] = f"{pl['meta']['snapshot_id'].split(':')[0]}:{total}"
+        return {"id": pid, "total": total, "snapshot_id": pl["meta"]["snapshot_id"]}
+
+    def _playlist(self, pid: str):
+        with self._lock:
+            pl = self.playlists.get(pid)
+        if pl is None and self.any_id and re.fullmatch(r"[A-Za-z0-9]{22}", pid):
+            # on-demand synthetic playlist, stable per id
+            self.add_playlist(synthetic_playlist(self.any_id, seed=zlib.crc32(pid.encode()), playlist_id=pid))
+            pl = self.playlists[pid]
+        return pl
+
+    # --- lifecycle ---
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def settings(self) -> dict:
+        """Environment for pointing the app's client at this server."""
+        return {
+            "SPOTIFY_API_BASE": f"{self.base_url}/v1/",
+            "SPOTIFY_TOKEN_URL": f"{self.base_url}/api/token",
+            "SPOTIFY_CLIENT_ID": "standin",
+            "SPOTIFY_CLIENT_SECRET": "standin",
+        }
+
+    # --- counters ---
+    def reset(self):
+        with self._lock:
+            self._requests, self._status = Counter(), Counter()
+            self._bytes_out = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self._requests),
+                "status": {str(k): v for k, v in self._status.items()},
+                "bytes_out": self._bytes_out,
+                "playlists": {pid: len(pl["items"]) for pid, pl in self.playlists.items()},
+            }
+
+    def _count(self, endpoint: str, status: int, n_bytes: int):
+        with self._lock:
+            self._requests[endpoint] += 1
+            self._status[status] += 1
+            self._bytes_out += n_bytes
+
+    # --- auth / faults ---
+    def issue_token(self) -> dict:
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return {"access_token": token, "token_type": "Bearer", "expires_in": self.token_ttl}
+
+    def token_valid(self, header: str | None) -> bool:
+        if not header or not header.startswith("Bearer "):
+            return False
+        with self._lock:
+            expires = self._tokens.get(header[len("Bearer "):])
+        return expires is not None and expires > time.time()
+
+    def draw_fault(self):
+        """None, or the (status, headers) of an injected error."""
+        with self._lock:
+            r, delay = self._rng.random(), self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if r < self.rate_429:
+            return 429, {"Retry-After": f"{self.retry_after:g}"}
+        if r < self.rate_429 + self.rate_5xx:
+            return 503, {}
+        return None
+
+
+def _error(status: int, message: str) -> dict:
+    return {"error": {"status": status, "message": message}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API behind a pooled session
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, endpoint: str, status: int, body: dict, headers: dict | None = None, pad: bool = False):
+        standin = self.server.standin
+        if pad and standin.pad_bytes:
+            body = {**body, "_padding": "x" * standin.pad_bytes}
+        data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        standin._count(endpoint, status, len(data))
+
+    def do_POST(self):
+        standin = self.server.standin
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if url.path == "/api/token":
+            return self._send("token", 200, standin.issue_token())
+        if url.path == "/__reset":
+            standin.reset()
+            return self._send("control", 200, {"ok": True})
+        m = _APPEND_RE.match(url.path)
+        if m:
+            out = standin.append_tracks(m.group(1), int(query.get("n", ["25"])[0]))
+            return self._send("control", 200 if out else 404, out or _error(404, "Resource not found"))
+        return self._send("other", 404, _error(404, "Service not found"))
+
+    def do_GET(self):
+        standin = self.server.standin
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/__stats":
+            return self._send("control", 200, standin.stats())
+
+        m = _PLAYLIST_RE.match(url.path)
+        endpoint = ("playlist_tracks" if m.group(2) else "playlist") if m else \
+                   "artists" if url.path.rstrip("/") == "/v1/artists" else "other"
+        if not standin.token_valid(self.headers.get("Authorization")):
+            return self._send(endpoint, 401, _error(401, "Invalid access token"))
+        fault = standin.draw_fault()
+        if fault:
+            status, headers = fault
+            msg = "API rate limit exceeded" if status == 429 else "Service unavailable"
+            return self._send(endpoint, status, _error(status, msg), headers)
+
+        fields = query.get("fields")
+        if m:
+            pl = standin._playlist(m.group(1))
+            if pl is None:
+                return self._send(endpoint, 404, _error(404, "Resource not found"))
+            if not m.group(2):
+                meta = {**pl["meta"], "tracks": {**pl["meta"].get("tracks", {}), "total": len(pl["items"])}}
+                return self._send(endpoint, 200, apply_fields(meta, fields), pad=True)
+            offset, limit = int(query.get("offset", 0)), int(query.get("limit", PAGE_MAX))
+            if not 1 <= limit <= PAGE_MAX:
+                return self._send(endpoint, 400, _error(400, "Invalid limit"))
+            page = paginate(m.group(1), pl["items"], offset, limit, api=f"{standin.base_url}/v1")
+            return self._send(endpoint, 200, apply_fields(page, fields), pad=True)
+
+        if endpoint == "artists":
+            ids = [i for i in query.get("ids", "").split(",") if i]
+            if not 1 <= len(ids) <= ARTISTS_MAX:
+                return self._send(endpoint, 400, _error(400, "Invalid ids"))
+            with standin._lock:
+                found = [standin.artists.get(i) for i in ids]
+            return self._send(endpoint, 200, {"artists": found}, pad=True)
+
+        return self._send(endpoint, 404, _error(404, "Service not found"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--synthetic", type=int, nargs="*", default=[100, 1000, 5000],
+                    help="synthetic playlist sizes to serve")
+    ap.add_argument("--no-fixtures", action="store_true", help="skip recorded fixtures")
+    ap.add_argument("--any-id", type=int, default=0, metavar="N",
+                    help="serve unknown 22-char ids as synthetic playlists of N tracks")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0, help="share of API requests answered with 429")
+    ap.add_argument("--retry-after", type=float, default=1.0)
+    ap.add_argument("--rate-5xx", type=float, default=0.0, help="share of API requests answered with 503")
+    ap.add_argument("--pad-bytes", type=int, default=0)
+    ap.add_argument("--token-ttl", type=int, default=3600)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    standin = StandIn(host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      rate_429=args.rate_429, retry_after=args.retry_after, rate_5xx=args.rate_5xx,
+                      pad_bytes=args.pad_bytes, token_ttl=args.token_ttl, any_id=args.any_id, seed=args.seed)
+    ids = [] if args.no_fixtures else standin.load_fixtures()
+    ids += [standin.add_synthetic(n) for n in args.synthetic]
+    standin.start()
+    print(json.dumps({"base_url": standin.base_url, "settings": standin.settings, "playlists": ids}, indent=2))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
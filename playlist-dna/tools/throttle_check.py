@@ -0,0 +1,85 @@
+# tools/throttle_check.py
+"""Drive concurrent spotify_call()s against a local stub that answers 429s.
+
+    python -m tools.throttle_check [--callers 16] [--throttled 5] [--retry-after 1]
+
+The stub answers the first --throttled requests with 429 + Retry-After and
+everything after that with a small /artists payload. With the global
+coordinator, one 429 pauses every caller, so the stub should see about
+callers + throttled requests instead of each caller retrying on its own.
+Prints one JSON document.
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import spotipy
+
+from src.core.auth import _build_session, spotify_call
+from src.core.throttle import coordinator
+
+
+def start_stub(throttled: int, retry_after: float):
+    state = {"requests": 0, "throttled": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state["requests"] += 1
+                throttle = state["throttled"] < throttled
+                if throttle:
+                    state["throttled"] += 1
+            if throttle:
+                body = b'{"error": {"status": 429, "message": "API rate limit exceeded"}}'
+                self.send_response(429)
+                self.send_header("Retry-After", str(retry_after))
+            else:
+                body = json.dumps({"artists": [{"id": "stub", "name": "Stub", "genres": [], "popularity": 0}]}).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--callers", type=int, default=16)
+    ap.add_argument("--throttled", type=int, default=5, help="how many requests get a 429")
+    ap.add_argument("--retry-after", type=float, default=1.0)
+    args = ap.parse_args()
+
+    server, state = start_stub(args.throttled, args.retry_after)
+    sp = spotipy.Spotify(auth="stub-token", requests_session=_build_session(), requests_timeout=5)
+    sp.prefix = f"http://127.0.0.1:{server.server_address[1]}/v1/"
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.callers) as pool:
+        results = list(pool.map(lambda _: spotify_call(sp.artists, ["stub"]), range(args.callers)))
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+
+    print(json.dumps({
+        "callers": args.callers,
+        "succeeded": sum(1 for r in results if r.get("artists")),
+        "upstream_requests": state["requests"],
+        "upstream_429s": state["throttled"],
+        "elapsed_seconds": round(elapsed, 3),
+        **coordinator.stats(),
+        "events": list(coordinator.events),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
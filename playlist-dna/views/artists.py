@@ -1,5 +1,4 @@
 # src/views/artists.py
-import pandas as pd
 import altair as alt
 import streamlit as st
 
@@ -7,30 +6,25 @@ PRIMARY = "#43a047"  # keep in sync with your theme
 
 def render_artists(PALETTE, PRIMARY, SECONDARY, FILL):
     """Artists tab: lollipop chart of top lead artists by track appearances."""
-    if "enriched" not in st.session_state:
+    if "bundle" not in st.session_state:
         st.info("Analyze a playlist to view Artists.")
         return
 
-    enriched: pd.DataFrame = st.session_state["enriched"]
-    if enriched.empty or "artist" not in enriched.columns:
+    bundle = st.session_state["bundle"]
+    if bundle.lead_artists.empty:
         st.info("No artist data available.")
         return
 
-    # Derive lead artist (first credited)
-    lead = enriched.copy()
-    lead["lead_artist"] = lead["artist"].astype(str).str.split(", ").str[0]
+    _top_artists(bundle, PRIMARY)
 
+
+@st.fragment
+def _top_artists(bundle, PRIMARY):
     # Control: how many to show
     top_n = st.slider("How many artists to show", 5, 50, 25, 1)
 
-    counts = (
-        lead["lead_artist"]
-        .value_counts()
-        .head(top_n)
-        .reset_index()
-        .rename(columns={"index": "artist", "lead_artist": "count"})  # value_counts reset
-    )
-    counts.columns = ["artist", "count"]  # ensure exact names
+    # Lead artist (first credited) per track, precomputed and sorted in the bundle
+    counts = bundle.top_artists(top_n)
 
     st.caption(f"Top artists by track appearances (lead artist, top {top_n})")
 
@@ -1,24 +1,30 @@
 # views/companion.py
-import os
 from pathlib import Path
 import streamlit as st
 from src.core.stats import compute_stats, compute_evolution_stats, pick_openai_model, llm_vibe_summary_detailed, build_rule_based_summary
 from src.ui.typing import typewriter
+from src.core.settings import get_setting
 
 APP_DIR = Path(__file__).resolve().parents[1]
 ROBOT_PATH = APP_DIR / "assets" / "robot_image.png"   # <-- place your image here
 
 def render_companion(PALETTE, PRIMARY, SECONDARY, FILL):
-    if "tracks_df" not in st.session_state or "enriched" not in st.session_state:
+    if "tracks_df" not in st.session_state or "bundle" not in st.session_state:
         st.info("Analyze a playlist to view the AI companion.")
         return
 
     tracks_df = st.session_state["tracks_df"]
-    enriched  = st.session_state["enriched"]
+    bundle    = st.session_state["bundle"]
+    genres    = st.session_state["genre_matrix"]
 
     st.subheader("Playlist Companion (AI)")
 
-    has_key = bool(st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY"))
+    _companion(tracks_df, bundle, genres)
+
+
+@st.fragment
+def _companion(tracks_df, bundle, genres):
+    has_key = bool(get_setting("OPENAI_API_KEY"))
     model_note = pick_openai_model() if has_key else None
     st.markdown(
         f"✨ **AI mode** — {model_note or 'auto'}"
@@ -70,8 +76,8 @@ def render_companion(PALETTE, PRIMARY, SECONDARY, FILL):
 
     # Generate/Regenerate behavior
     if gen or regen:
-        stats = compute_stats(tracks_df, enriched)
-        evolution = compute_evolution_stats(tracks_df, enriched)
+        stats = compute_stats(bundle)
+        evolution = compute_evolution_stats(tracks_df, bundle)
         title = st.session_state.get("meta", {}).get("name")
 
         # Show robot immediately as we start typing
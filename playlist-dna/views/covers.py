@@ -16,7 +16,13 @@ def render_covers(PALETTE, PRIMARY, SECONDARY, FILL):
         return
 
     st.caption("Album covers (neatly aligned)")
+    _cover_grid(thumbs_all)
 
+
+@st.fragment
+def _cover_grid(thumbs_all: pd.DataFrame):
+    """Covers in the `covers_idx` order shuffled once per analyze, so the grid
+    does not reshuffle when a slider moves."""
     # Controls (optional)
     total_available = len(thumbs_all)
     max_show = min(100, total_available)  # safety cap
@@ -1,9 +1,9 @@
 # src/views/description.py
-import os
 import datetime
 import streamlit as st
 import pandas as pd
 import altair as alt
+from src.core.settings import get_setting
 
 def render_description():
     st.title("About • Playlist DNA")
@@ -20,6 +20,7 @@ It’s designed for music lovers, data explorers, and creators who want to *see
         """
 - **Overview** – key stats, track sample, and a genre donut  
 - **Evolution** – playlist growth, genre shifts, and weekday×hour activity  
+- **Timelapse** – genre, decade and artist mix replayed in the order tracks were added  
 - **Genres & Artists** – explore top genres and lead artists interactively  
 - **Time** – decade breakdown and artist×year heatmap  
 - **Popularity** – histogram plus popularity vs. release year  
@@ -55,8 +56,6 @@ It’s designed for music lovers, data explorers, and creators who want to *see
     st.markdown("### Known limitations")
     st.markdown(
         """
-- **One-time tab bounce** – First click inside any tab may briefly reroute to *Overview* once per session.  
-  *(Workaround: click back into your tab — it won’t happen again.)*  
 - **Spotify-made playlists only** – Personalized lists (like *Discover Weekly*) can’t be fetched via client credentials.  
 - **Missing timestamps** – Some playlists lack `added_at` data; *Evolution* and *Search* visuals may show partial results.  
 - **Genre sparsity** – Some niche artists lack proper tagging, showing “unknown.”  
@@ -71,6 +70,7 @@ It’s designed for music lovers, data explorers, and creators who want to *see
 - Empty charts? Try another **Market** (US, GB, DE, FR, CA, AU, BR, JP).  
 - Overfiltered genres? Use **Clear filter** to reset.  
 - Misalignment? Use **Clear cache & rerun** from the sidebar.  
+- Sharing a view? The URL remembers it (e.g. `?view=genres`).  
 - For better summaries, use playlists with **30+ diverse tracks**.
 """
     )
@@ -78,7 +78,6 @@ It’s designed for music lovers, data explorers, and creators who want to *see
     st.markdown("### Roadmap")
     st.markdown(
         """
-- Playlist **evolution timelapse** visualization  
 - Cross-playlist comparison  
 - Optional **Spotify login** for private lists  
 - Richer AI Companion insights (tone, emotional palette, trends)  
@@ -98,7 +97,7 @@ AI Companion powered by **OpenAI** (optional).
         st.write("Streamlit:", st.__version__)
         st.write("Altair:", alt.__version__)
         st.write("Pandas:", pd.__version__)
-        st.write("OpenAI key configured:", bool(st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")))
+        st.write("OpenAI key configured:", bool(get_setting("OPENAI_API_KEY")))
 
     # --- Footer ---
     st.markdown("---")
@@ -3,38 +3,31 @@ import pandas as pd
 import altair as alt
 import streamlit as st
 
+from src.core.timeline import WEEKDAYS, dates
+
 PALETTE  = ["#1b5e20","#2e7d32","#388e3c","#43a047","#4caf50","#66bb6a","#81c784","#a5d6a7","#c8e6c9"]
 PRIMARY  = "#43a047"
 FILL     = "#66bb6a"
 
 def render_evolution(PALETTE, PRIMARY, SECONDARY, FILL):
     """Evolution tab: growth curve, genre-over-time, weekday×hour heatmap."""
-    if "tracks_df" not in st.session_state or "enriched" not in st.session_state:
+    if "tracks_df" not in st.session_state or "model" not in st.session_state:
         st.info("Analyze a playlist to see its evolution over time.")
         return
 
-    tracks_df = st.session_state["tracks_df"].copy()
-    enriched  = st.session_state["enriched"].copy()
+    # Calendar keys (ints, naive UTC) precomputed per dated track
+    t         = st.session_state["bundle"].times
 
     # guard for added_at
-    if "added_at" not in tracks_df or tracks_df["added_at"].isna().all():
+    if t.empty:
         st.info("This playlist has no `added_at` timestamps available.")
         return
 
-    # ---- Common time keys ----
-    t = tracks_df.dropna(subset=["added_at"]).copy()
-    # ensure timezone-naive for Altair
-    t["date"]    = t["added_at"].dt.tz_convert(None).dt.date
-    t["month"]   = t["added_at"].dt.tz_convert(None).dt.to_period("M").dt.to_timestamp()
-    t["weekday"] = t["added_at"].dt.tz_convert(None).dt.day_name()
-    t["hour"]    = t["added_at"].dt.tz_convert(None).dt.hour
-
     # ---- 1) Growth curve (cumulative tracks over time) ----
     st.subheader("Playlist growth over time")
 
-    growth = (
-        t.groupby("date").size().reset_index(name="added").sort_values("date")
-    )
+    per_day = t["day"].value_counts().sort_index()
+    growth = pd.DataFrame({"date": dates(per_day.index), "added": per_day.to_numpy()})
     growth["cumulative"] = growth["added"].cumsum()
 
     area = (
@@ -55,33 +48,9 @@ def render_evolution(PALETTE, PRIMARY, SECONDARY, FILL):
 
     # ---- 2) Genre evolution (stacked area by month, top 8) ----
     st.subheader("Genre footprint over time (top 8)")
-
-    g = enriched.dropna(subset=["added_at"]).copy()
-    g["month"] = g["added_at"].dt.tz_convert(None).dt.to_period("M").dt.to_timestamp()
-    g = g.explode("genres")
-    g["genres"] = g["genres"].fillna("unknown")
-
-    if not g.empty:
-        topK = g["genres"].value_counts().head(8).index.tolist()
-        g_top = g[g["genres"].isin(topK)]
-        genre_month = (
-            g_top.groupby(["month","genres"]).size().reset_index(name="count").sort_values("month")
-        )
-        if not genre_month.empty:
-            area = (
-                alt.Chart(genre_month)
-                .mark_area(opacity=0.85)
-                .encode(
-                    x=alt.X("month:T", title="Month added"),
-                    y=alt.Y("count:Q", stack="normalize", title="Share of tracks"),
-                    color=alt.Color("genres:N", title="Genre", scale=alt.Scale(range=PALETTE)),
-                    tooltip=["month:T","genres:N","count:Q"],
-                )
-                .properties(height=320)
-            )
-            st.altair_chart(area, use_container_width=True)
-        else:
-            st.info("Not enough genre data to show evolution.")
+    trends = st.session_state["bundle"].trends
+    if trends.totals.any():
+        _genre_trends(trends, PALETTE)
     else:
         st.info("Not enough genre data to show evolution.")
 
@@ -89,7 +58,8 @@ def render_evolution(PALETTE, PRIMARY, SECONDARY, FILL):
     st.subheader("When are tracks added? (weekday × hour)")
     wh = t.groupby(["weekday","hour"]).size().reset_index(name="count")
     if not wh.empty:
-        weekday_order = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+        wh["weekday"] = [WEEKDAYS[d] for d in wh["weekday"]]
+        weekday_order = list(WEEKDAYS)
         heat = (
             alt.Chart(wh)
             .mark_rect()
@@ -105,3 +75,35 @@ def render_evolution(PALETTE, PRIMARY, SECONDARY, FILL):
     else:
         st.info("Not enough timestamp data for activity heatmap.")
 
+
+@st.fragment
+def _genre_trends(trends, PALETTE):
+    """`trends` holds cumulative monthly counts, so any smoothing window is one
+    subtraction per genre; nothing is regrouped when the slider moves."""
+    window = st.slider("Smoothing (months)", min_value=1, max_value=max(2, min(12, trends.n_months)), value=1,
+                       help="Shares over the trailing N months")
+    genre_month = trends.frame(8, window)
+    # months where none of these genres was added would normalize to 0/0
+    genre_month = genre_month[genre_month.groupby("month")["count"].transform("sum") > 0]
+    area = (
+        alt.Chart(genre_month)
+        .mark_area(opacity=0.85)
+        .encode(
+            x=alt.X("month:T", title="Month added"),
+            y=alt.Y("count:Q", stack="normalize", title="Share of tracks"),
+            color=alt.Color("genres:N", title="Genre", scale=alt.Scale(range=PALETTE)),
+            tooltip=["month:T","genres:N","count:Q", alt.Tooltip("share:Q", format=".0%", title="Share of adds")],
+        )
+        .properties(height=320)
+    )
+    st.altair_chart(area, use_container_width=True)
+
+    rising, falling = trends.movers(k=5)
+    c1, c2 = st.columns(2)
+    c1.markdown("**Rising**  \n" + ("  \n".join(f"{g} (+{d:.0%})" for g, d in rising) or "—"))
+    c2.markdown("**Cooling**  \n" + ("  \n".join(f"{g} ({d:.0%})" for g, d in falling) or "—"))
+    shifts = trends.change_points(k=5)
+    if not shifts.empty:
+        st.caption("Turning points: " + "; ".join(
+            f"{g} around {str(m)[:7]} ({b:.0%} → {a:.0%} of adds)"
+            for g, m, b, a in zip(shifts["genre"], shifts["month"], shifts["before"], shifts["after"])))
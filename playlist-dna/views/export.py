@@ -14,16 +14,22 @@ def _serialize_genres(series: pd.Series, mode: str = "json") -> pd.Series:
 
 def render_export():
     """Export tab: download tracks + artists as CSV/Parquet."""
-    if "tracks_df" not in st.session_state or "enriched" not in st.session_state:
+    if "tracks_df" not in st.session_state or "model" not in st.session_state:
         st.info("Analyze a playlist to export data.")
         return
 
-    tracks_df: pd.DataFrame = st.session_state["tracks_df"].copy()
-    enriched:  pd.DataFrame = st.session_state["enriched"].copy()
+    tracks_df: pd.DataFrame = st.session_state["tracks_df"]
+    artists:   pd.DataFrame = st.session_state["model"].artists
+    facts = st.session_state["bundle"].track_facts if "bundle" in st.session_state else None
 
     st.subheader("Download your data")
     st.caption("Choose a format below to export tracks and (deduped) artists.")
+    _downloads(tracks_df, artists, facts)
 
+
+@st.fragment
+def _downloads(tracks_df: pd.DataFrame, artists: pd.DataFrame, facts: pd.DataFrame | None = None):
+    """`facts` is bundle.track_facts (same index as `tracks_df`); joined only when asked for."""
     colA, colB, colC = st.columns([1.2, 1, 1.2])
     with colA:
         fmt = st.radio("Format", ["CSV", "Parquet"], horizontal=True, index=0)
@@ -31,6 +37,9 @@ def render_export():
         genre_format = st.selectbox("Genre field format", ["json", "pipe"], index=0, help="How to serialize the genres list")
     with colC:
         include_index = st.checkbox("Include index (CSV only)", value=False)
+        include_facts = facts is not None and st.checkbox(
+            "Include derived columns", value=False,
+            help="Popularity rank and percentile, order added, age at add, decade")
 
     # ---- Tracks export ----
     st.markdown("**Tracks**")
@@ -38,6 +47,8 @@ def render_export():
     # Keep a sensible subset/order; export everything if you prefer
     cols = ["id", "name", "artist", "album", "release_year", "popularity", "url", "image", "added_at", "added_by_name"]
     tracks_out = tracks_out[[c for c in cols if c in tracks_out.columns]]
+    if include_facts:
+        tracks_out = tracks_out.join(facts)  # same index as tracks_df
 
     if fmt == "CSV":
         csv_bytes = tracks_out.to_csv(index=include_index).encode("utf-8")
@@ -64,12 +75,8 @@ def render_export():
 
     # ---- Artists export (deduped) ----
     st.markdown("**Artists (deduped)**")
-    if {"artist_id", "artist_name"}.issubset(enriched.columns):
-        export_art = (
-            enriched[["artist_id", "artist_name", "genres", "artist_popularity"]]
-            .drop_duplicates(subset=["artist_id"])
-            .reset_index(drop=True)
-        )
+    if not artists.empty:
+        export_art = artists[["artist_id", "artist_name", "genres", "artist_popularity"]].copy()
         if "genres" in export_art.columns:
             export_art["genres"] = _serialize_genres(export_art["genres"], mode=genre_format)
 
@@ -3,12 +3,12 @@ import pandas as pd
 import altair as alt
 
 def render_genres(PALETTE, PRIMARY, SECONDARY, FILL):
-    if "tracks_df" not in st.session_state or "enriched" not in st.session_state:
+    if "tracks_df" not in st.session_state or "bundle" not in st.session_state:
         st.info("Analyze a playlist to view Genres.")
         return
 
-    tracks_df = st.session_state["tracks_df"]
-    enriched  = st.session_state["enriched"]
+    bundle = st.session_state["bundle"]
+    genres = st.session_state["genre_matrix"]
 
     # Unique key for this tab
     KEY = "genres_tab_filter"
@@ -21,17 +21,36 @@ def render_genres(PALETTE, PRIMARY, SECONDARY, FILL):
     if KEY not in st.session_state:
         st.session_state[KEY] = []
 
-    all_genres = (
-        enriched.explode("genres")["genres"].dropna().value_counts().head(50).index.tolist()
-    )
+    _genre_bars(bundle, genres, KEY, PRIMARY)
+
+    # Which genres show up on the same tracks
+    with st.expander("Genre pairs (top 12)"):
+        pairs = bundle.genre_pairs
+        if len(pairs) > 1:
+            long = pairs.rename_axis("genre").reset_index().melt("genre", var_name="with", value_name="tracks")
+            heat = alt.Chart(long).mark_rect().encode(
+                x=alt.X("with:N", sort=list(pairs.columns), title=None),
+                y=alt.Y("genre:N", sort=list(pairs.index), title=None),
+                color=alt.Color("tracks:Q", title="Tracks", scale=alt.Scale(range=PALETTE[::-1])),
+                tooltip=["genre", "with", "tracks"],
+            ).properties(height=360)
+            st.altair_chart(heat, use_container_width=True)
+        else:
+            st.info("Not enough genre data for pairs.")
+
 
-    # Clear button FIRST (inline handling, no callback)
+@st.fragment
+def _genre_bars(bundle, genres, KEY, PRIMARY):
+    """The selection lives in st.session_state[KEY], which app.py keeps across tab
+    switches (KEEP_WIDGET_STATE)."""
+    all_genres = bundle.top_genres(50)["genre"].tolist()
+
+    # Clear button FIRST; the callback empties the filter before this fragment reruns
     clear_col = st.columns([1, 3, 1])[0]
     with clear_col:
         if st.session_state[KEY]:
-            if st.button("Clear genre filter", key="genres_clear_btn"):
-                st.session_state[KEY] = []
-                st.rerun()
+            st.button("Clear genre filter", key="genres_clear_btn",
+                      on_click=lambda: st.session_state.update({KEY: []}))
 
     # Multiselect (no default; controlled via state key)
     sel_genres = st.multiselect(
@@ -41,16 +60,12 @@ def render_genres(PALETTE, PRIMARY, SECONDARY, FILL):
     )
     selected = sel_genres or st.session_state[KEY]
 
-    filtered = (
-        enriched[enriched["genres"].apply(lambda g: any(x in (g or []) for x in selected))]
-        if selected else enriched
-    )
+    mask = genres.any_of(selected) if selected else None
 
-    st.caption(f"Filtered tracks: {filtered['id'].nunique()} / {tracks_df['id'].nunique()}")
+    st.caption(f"Filtered tracks: {int(mask.sum()) if selected else genres.n_tracks} / {genres.n_tracks}")
 
-    fg = filtered.explode("genres")
-    top_genres = fg["genres"].dropna().value_counts().head(20).reset_index()
-    top_genres.columns = ["genre", "count"]
+    # unfiltered counts are precomputed; a filter needs a pass over the matrix
+    top_genres = genres.top(20, mask) if selected else bundle.top_genres(20)
 
     if not top_genres.empty:
         chart_genres = alt.Chart(top_genres).mark_bar(color=PRIMARY).encode(
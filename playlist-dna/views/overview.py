@@ -1,25 +1,73 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
+from src.core.throttle import coordinator
+from src.core.bundle import AnalysisBundle, PartialOverview
+
+def _metrics(bundle: AnalysisBundle | PartialOverview):
+    cA, cB, cC = st.columns(3)
+    cA.metric("Tracks analyzed", bundle.n_tracks)
+    cB.metric("Unique artists", bundle.n_artists)
+    cC.metric("Median popularity", int(bundle.median_popularity))
+
+
+def _genre_donut(bundle: AnalysisBundle | PartialOverview, PALETTE, size: int = 520):
+    genre_counts = bundle.top_genres(12)
+    if not genre_counts.empty:
+        donut = (
+            alt.Chart(genre_counts)
+            .encode(
+                theta=alt.Theta("count:Q", stack=True),
+                color=alt.Color("genre:N", legend=None, scale=alt.Scale(range=PALETTE)),
+                order=alt.Order("count:Q", sort="descending"),
+                tooltip=["genre:N","count:Q"]
+            )
+            .mark_arc(innerRadius=size * 120 // 520, outerRadius=size * 220 // 520, stroke="white", strokeWidth=1)
+            .properties(width=size, height=size)
+        )
+        st.altair_chart(donut, use_container_width=True)
+    else:
+        st.info("No genre data available for a donut chart.")
+
+
+def render_overview_partial(bundle: PartialOverview, PALETTE, PRIMARY):
+    """Live Overview while pages are still arriving (metrics + genre donut so far)."""
+    if not bundle.n_tracks:
+        return
+    st.caption("Partial results — updating as pages arrive")
+    _metrics(bundle)
+    _genre_donut(bundle, PALETTE, size=320)
+
 
 def render_overview(PALETTE, PRIMARY, SECONDARY, FILL):
     st.set_page_config(layout="wide", initial_sidebar_state="expanded")
 
-    if ("tracks_df" not in st.session_state) or ("enriched" not in st.session_state):
+    if ("tracks_df" not in st.session_state) or ("bundle" not in st.session_state):
         st.info("Paste a public playlist and analyze to begin.")
         return
 
     meta = st.session_state["meta"]
     tracks_df = st.session_state["tracks_df"]
-    enriched  = st.session_state["enriched"]
+    bundle    = st.session_state["bundle"]
 
     st.caption(f"📃 Playlist: **{meta['name']}** by **{meta['owner']}**  •  Usable tracks: {len(tracks_df)}  •  Dropped: {meta['dropped']}")
+    if meta.get("artist_store"):
+        hits, misses = meta["artist_store"]["hits"], meta["artist_store"]["misses"]
+        refresh = {"unchanged": "snapshot unchanged, tracks reloaded from disk",
+                   "incremental": "snapshot changed, only modified pages refetched",
+                   "full": "full fetch"}.get(meta.get("refresh"), "")
+        st.caption(f"🗄️ Artist store: {hits} cached  •  {misses} fetched" + (f"  •  {refresh}" if refresh else ""))
+    throttle = coordinator.stats()
+    if throttle["throttle_events"]:
+        st.caption(f"⏳ Spotify rate limits: {throttle['throttle_events']} × 429  •  "
+                   f"{throttle['lost_seconds']:.1f}s paused (all sessions)")
+    memory = meta.get("memory")
+    if memory:
+        before = memory["before"]["total"] / 2**20
+        after = memory["after"]["total"] / 2**20 if memory.get("after") else None
+        st.caption(f"🧠 Session frames: {before:.1f} MB"
+                   + (f" → {after:.1f} MB with the compact schema" if after is not None else ""))
 
-    cA, cB, cC = st.columns(3)
-    cA.metric("Tracks analyzed", tracks_df["id"].nunique())
-    unique_artists = enriched.get("artist_name", pd.Series(dtype=str)).nunique() or tracks_df["artist"].nunique()
-    cB.metric("Unique artists", int(unique_artists))
-    cC.metric("Median popularity", int(tracks_df["popularity"].median() if not tracks_df.empty else 0))
+    _metrics(bundle)
 
     # sample
     N_PREVIEW = 15
@@ -30,22 +78,5 @@ def render_overview(PALETTE, PRIMARY, SECONDARY, FILL):
                      use_container_width=True, hide_index=True)
 
     # donut genres
-    g_exploded = enriched.explode("genres")
-    genre_counts = g_exploded["genres"].dropna().value_counts().head(12).reset_index()
-    genre_counts.columns = ["genre","count"]
     st.subheader("Genre footprint (top 12)")
-    if not genre_counts.empty:
-        donut = (
-            alt.Chart(genre_counts)
-            .encode(
-                theta=alt.Theta("count:Q", stack=True),
-                color=alt.Color("genre:N", legend=None, scale=alt.Scale(range=PALETTE)),
-                order=alt.Order("count:Q", sort="descending"),
-                tooltip=["genre:N","count:Q"]
-            )
-            .mark_arc(innerRadius=120, outerRadius=220, stroke="white", strokeWidth=1)
-            .properties(width=520, height=520)
-        )
-        st.altair_chart(donut, use_container_width=True)
-    else:
-        st.info("No genre data available for a donut chart.")
+    _genre_donut(bundle, PALETTE)
@@ -13,40 +13,50 @@ def render_popularity(PALETTE, PRIMARY, SECONDARY, FILL):
         return
 
     tracks_df: pd.DataFrame = st.session_state["tracks_df"]
+    bundle = st.session_state["bundle"]
 
     # --- Popularity histogram ---
     st.subheader("Popularity distribution")
-    pop = tracks_df.dropna(subset=["popularity"]).copy()
-    if pop.empty:
+    if bundle.popularity_counts.empty:
         st.info("No popularity data available.")
     else:
-        bins = st.slider("Bins", min_value=8, max_value=40, value=20, step=1, help="Histogram bin count")
-        chart_pop = (
-            alt.Chart(pop)
-            .mark_bar(color=PRIMARY)
-            .encode(
-                x=alt.X("popularity:Q", bin=alt.Bin(maxbins=bins), title="Popularity (0–100)"),
-                y=alt.Y("count():Q", title="Tracks"),
-                tooltip=[alt.Tooltip("count():Q", title="Tracks")],
-            )
-            .properties(height=300)
-        )
-        st.altair_chart(chart_pop, use_container_width=True)
+        _histogram(bundle.popularity_counts, PRIMARY)
 
     # --- Popularity vs. time ---
     st.subheader("Popularity vs. time")
-    td2 = tracks_df.dropna(subset=["release_year", "popularity"]).copy()
+    td2 = tracks_df.assign(decade=bundle.track_facts["decade"]).dropna(subset=["release_year", "popularity"])
     if td2.empty:
         st.info("No release years available for scatter plot.")
         return
+    _popularity_vs_time(td2, SECONDARY)
+
+
+@st.fragment
+def _histogram(counts: pd.DataFrame, PRIMARY):
+    """`counts` is tracks per popularity value (at most 101 rows), so the chart
+    re-bins the same small table whatever the playlist size."""
+    bins = st.slider("Bins", min_value=8, max_value=40, value=20, step=1, help="Histogram bin count")
+    chart_pop = (
+        alt.Chart(counts)
+        .mark_bar(color=PRIMARY)
+        .encode(
+            x=alt.X("popularity:Q", bin=alt.Bin(maxbins=bins), title="Popularity (0–100)"),
+            y=alt.Y("sum(count):Q", title="Tracks"),
+            tooltip=[alt.Tooltip("sum(count):Q", title="Tracks")],
+        )
+        .properties(height=300)
+    )
+    st.altair_chart(chart_pop, use_container_width=True)
+
 
+@st.fragment
+def _popularity_vs_time(td2: pd.DataFrame, SECONDARY):
     # Let users choose year granularity
     granularity = st.radio(
         "Time granularity", ["Year", "Decade"], horizontal=True, index=0
     )
 
     if granularity == "Decade":
-        td2["decade"] = (td2["release_year"] // 10) * 10
         x_field = alt.X("decade:O", title="Decade")
     else:
         x_field = alt.X("release_year:O", title="Year")
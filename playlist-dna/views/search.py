@@ -7,85 +7,50 @@ import altair as alt
 import numpy as np
 
 
-
-def _genres_for_track(enriched: pd.DataFrame, track_id: str) -> list[str]:
-    g = (
-        enriched.loc[enriched["id"] == track_id, "genres"]
-        .explode()
-        .dropna()
-        .astype(str)
-        .str.strip()
-    )
-    # keep order by frequency, then alpha
-    counts = g.value_counts()
-    ordered = (
-        counts.sort_values(ascending=False)
-        .index.tolist()
-    )
-    return ordered[:20]  # cap for display
-
-
-def _percentile(series: pd.Series, value: float) -> float:
-    if series.empty:
-        return 0.0
-    return (series <= value).mean() * 100.0
-
-
 def render_search(PALETTE, PRIMARY, SECONDARY, FILL):
-    if "tracks_df" not in st.session_state or "enriched" not in st.session_state:
+    if "tracks_df" not in st.session_state or "search_index" not in st.session_state:
         st.info("Analyze a playlist to use Search.")
         return
 
-    tracks_df: pd.DataFrame = st.session_state["tracks_df"].copy()
-    enriched: pd.DataFrame = st.session_state["enriched"].copy()
+    tracks_df: pd.DataFrame = st.session_state["tracks_df"]
 
     st.subheader("Search a track in this playlist")
 
-    # Build a searchable label: "Song — Artist"
-    tracks_df["label"] = tracks_df.apply(
-        lambda r: f"{r.get('name','—')} — {r.get('artist','—')}", axis=1
-    )
+    _search(tracks_df, st.session_state["search_index"], st.session_state["genre_matrix"],
+            st.session_state["bundle"], PRIMARY)
+
 
+@st.fragment
+def _search(tracks_df: pd.DataFrame, index, genre_matrix, bundle, PRIMARY):
+    """The query is keyed `search_q`, which app.py keeps across tab switches."""
     # --- Search box (reruns on each keystroke) ---
     q = st.text_input(
-        "Search by song or artist",
+        "Search by song, artist or album",
         placeholder="e.g., Circles or Post Malone",
         key="search_q",
     )
 
-    # Filter matches (case-insensitive on name or artist)
-    if q:
-        mask = (
-                tracks_df["name"].str.contains(q, case=False, na=False)
-                | tracks_df["artist"].str.contains(q, case=False, na=False)
-        )
-        matches = tracks_df[mask].copy()
-    else:
-        matches = tracks_df.copy()
-
-    # Build labels and take top N for suggestion list
-    matches["label"] = matches.apply(lambda r: f"{r.get('name', '—')} — {r.get('artist', '—')}", axis=1)
-    suggestions = matches.head(10)[["label", "id"]].reset_index(drop=True)
-
-    if suggestions.empty:
+    # Ranked rows from the prebuilt index (tolerates typos; playlist order when empty)
+    hits = index.search(q, limit=10)
+
+    if not len(hits):
         st.warning("No matches. Try a different keyword.")
-        st.stop()
+        return
 
     # Show a light “autocomplete” list that updates as you type
-    picked_label = st.radio(
+    picked = st.radio(
         "Suggestions",
-        options=suggestions["label"].tolist(),
+        options=hits.tolist(),
         index=0,
         key="search_suggestions",
+        format_func=lambda r: index.labels[r],
     )
 
-    # Resolve the selected row
-    sel = suggestions.loc[suggestions["label"] == picked_label].iloc[0]
-    tid = sel["id"]
-    row = tracks_df.loc[tracks_df["id"] == tid].iloc[0]
+    # Resolve the selected row (rows of the index follow tracks_df)
+    row = tracks_df.iloc[picked]
 
     # Gather more details
-    genres = _genres_for_track(enriched, tid)
+    genres = genre_matrix.genres_of(picked)[:20]  # most common first; cap for display
     release_year = row.get("release_year")
     popularity = int(row.get("popularity", 0) or 0)
     added_at = row.get("added_at")
@@ -112,13 +77,9 @@ def render_search(PALETTE, PRIMARY, SECONDARY, FILL):
         popularity = int(row.get("popularity", 0) or 0)
         added_at = row.get("added_at")
 
-        # Order added (by timestamp)
-        pos = None
-        if "added_at" in tracks_df and tracks_df["added_at"].notna().any() and pd.notna(added_at):
-            t_sorted = tracks_df.dropna(subset=["added_at"]).sort_values("added_at").reset_index(drop=True)
-            idx = t_sorted.index[t_sorted["id"] == tid]
-            if len(idx) > 0:
-                pos = int(idx[0]) + 1
+        # Rank, percentile and order added, precomputed per track in the bundle
+        facts = bundle.track(picked)
+        pos = facts["added_order"]
 
         # Age
         age = None
@@ -130,48 +91,32 @@ def render_search(PALETTE, PRIMARY, SECONDARY, FILL):
                 age = None
 
         # Playlist popularity stats
-        avg_pop = int(tracks_df["popularity"].mean()) if "popularity" in tracks_df else None
-        median_pop = int(tracks_df["popularity"].median()) if "popularity" in tracks_df else None
+        median_pop = int(bundle.median_popularity)
 
         # Genre keywords (no chart)
-        track_genres = (
-            enriched.loc[enriched["id"] == tid, "genres"]
-            .explode().dropna().astype(str).str.strip().unique().tolist()
-        )
+        track_genres = genres
         genre_keywords = ", ".join(track_genres[:10]) if track_genres else "—"
 
         # Metrics
         c1, c2, c3 = st.columns(3)
         c1.metric("Popularity", f"{popularity}/100")
         c2.metric("Median Popularity (playlist)", median_pop or "—")
-        c3.metric("Order Added", f"#{pos}" if pos else "—")
+        c3.metric("Order Added", f"#{int(pos)}" if pd.notna(pos) else "—")
 
         c4, c5, c6 = st.columns(3)
         c4.metric("Release Year", release_year if pd.notna(release_year) else "—")
         c5.metric("Song Age", f"{age} yrs" if age is not None else "—")
         c6.metric("Date Added", pd.to_datetime(added_at).date().isoformat() if pd.notna(added_at) else "—")
+        if pd.notna(facts["popularity_rank"]):
+            st.caption(f"Popularity rank #{int(facts['popularity_rank'])} of {int(bundle.popularity_counts['count'].sum())}"
+                       f" · as popular as or more than {facts['popularity_pct']:.0f}% of the playlist")
 
         # --- Popularity distribution with highlighted bin marker ---
-        if "popularity" in tracks_df and not tracks_df["popularity"].isna().all():
-
-            # Bin playlist popularities into 20 uniform bins (0–100 by 5s)
-            pop_series = tracks_df["popularity"].dropna().astype(float)
-            bins = list(range(0, 101, 2))  # 0,5,10,...,100 (20 bins)
-            labels = [f"{b}-{b + 5}" for b in bins[:-1]]
-            centers = [b + 2.5 for b in bins[:-1]]
-
-            binned = pd.cut(pop_series, bins=bins, right=False, labels=centers)  # label by bin center
-            hist = binned.value_counts().rename_axis("center").reset_index(name="count")
-            hist["center"] = hist["center"].astype(float)
-
-            # Find this track's bin center & count
-            track_center = float((popularity // 5) * 5 + 2.5)
-            track_row = hist.loc[hist["center"] == track_center]
-            track_count = int(track_row["count"].iloc[0]) if not track_row.empty else 0
+        if not bundle.popularity_counts.empty:
 
-            # --- Popularity Histogram ---
+            # --- Popularity Histogram (binned on the client from counts per value) ---
             bars = (
-                alt.Chart(tracks_df.dropna(subset=["popularity"]))
+                alt.Chart(bundle.popularity_counts)
                 .mark_bar(color=PRIMARY, opacity=0.8)
                 .encode(
                     x=alt.X(
@@ -179,8 +124,8 @@ def render_search(PALETTE, PRIMARY, SECONDARY, FILL):
                         bin=alt.Bin(maxbins=20),
                         title="Popularity (0–100)"
                     ),
-                    y=alt.Y("count():Q", title="Tracks"),
-                    tooltip=[alt.Tooltip("count():Q", title="Tracks")]
+                    y=alt.Y("sum(count):Q", title="Tracks"),
+                    tooltip=[alt.Tooltip("sum(count):Q", title="Tracks")]
                 )
             )
 
@@ -234,4 +179,4 @@ def render_search(PALETTE, PRIMARY, SECONDARY, FILL):
     # Raw details table (optional)
     with st.expander("Raw track details"):
         show_cols = ["name", "artist", "album", "release_year", "popularity", "added_at", "id", "url"]
-        st.dataframe(tracks_df.loc[[row.name], [c for c in show_cols if c in tracks_df.columns]], use_container_width=True)
+        st.dataframe(tracks_df.iloc[[picked]][[c for c in show_cols if c in tracks_df.columns]], use_container_width=True)
@@ -0,0 +1,40 @@
+# views/timelapse.py
+import json
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from src.core.timelapse import timelapse_payload
+
+APP_DIR = Path(__file__).resolve().parents[1]
+PLAYER_PATH = APP_DIR / "assets" / "timelapse.html"
+ROWS = 10  # bars per panel
+
+
+def render_timelapse(PALETTE, PRIMARY, SECONDARY, FILL):
+    """Timelapse tab: genre, decade and artist mix growing in the order tracks were added.
+
+    The whole history ships once as one payload; play/scrub run in the browser.
+    """
+    if "bundle" not in st.session_state or "model" not in st.session_state:
+        st.info("Analyze a playlist to play its timelapse.")
+        return
+
+    bundle = st.session_state["bundle"]
+    st.subheader("Playlist evolution timelapse")
+
+    # built once per (playlist_id, snapshot_id, market), then served from cache
+    payload = timelapse_payload(bundle.key, st.session_state["model"], st.session_state["genre_matrix"], bundle)
+    if payload is None:
+        st.info("This playlist has no `added_at` timestamps available.")
+        return
+
+    st.caption("Cumulative mix after each slice of additions, in the order tracks were added. "
+               "Press play or drag the slider.")
+    html = (PLAYER_PATH.read_text(encoding="utf-8")
+            .replace("__PAYLOAD__", payload.replace("</", "<\\/"))  # keep names from closing the script
+            .replace("__PALETTE__", json.dumps(PALETTE[::-1]))
+            .replace("__PRIMARY__", PRIMARY)
+            .replace("__ROWS__", str(ROWS)))
+    components.html(html, height=90 + ROWS * 26)